@@ -0,0 +1,190 @@
+"""Бенчмарк основного цикла main() на виртуальных часах."""
+import argparse
+import os
+import random
+import signal
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from functools import partial
+from typing import Dict, List, Optional
+
+import homework
+from circuit_breaker import CircuitBreaker
+from clock import VirtualClock
+from error_cache import ErrorCache
+from fake_api import STATUSES, make_homeworks
+from log_config import stop_logging
+from polling import AdaptiveInterval
+from sender import TelegramSender
+from state_cache import StateCache
+
+PATCHED = ('CLOCK', 'CACHE', 'STATE', 'SENDER', 'CLIENT', 'DELIVERY',
+           'OUTBOX', 'PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID',
+           'COMMANDS_ENABLED', 'METRICS_PORT', 'make_bot', 'fetch_api_answer',
+           'AdaptiveInterval')
+SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1)
+
+
+class NullBot:
+    """Бот, который ничего не отправляет."""
+
+    def send_message(self, chat_id, text, **kwargs):
+        return None
+
+    def get_me(self):
+        return None
+
+
+class CycleClock(VirtualClock):
+    """Виртуальные часы, останавливающие main() после `cycles` пауз."""
+
+    def __init__(self, cycles: int, stop: threading.Event) -> None:
+        super().__init__()
+        self.cycles = cycles
+        self.stop = stop
+
+    def sleep(self, seconds: float,
+              stop: Optional[threading.Event] = None) -> bool:
+        interrupted = super().sleep(seconds, stop)
+        if self.sleeps >= self.cycles:
+            self.stop.set()
+        return interrupted
+
+
+class SimulatedAPI:
+    """
+    API Практикума в памяти: с вероятностью `churn` за цикл
+    меняется статус одной работы; отдаются работы, обновлённые
+    после `from_date`, как это делает настоящий API.
+    """
+
+    def __init__(self, clock: VirtualClock, homeworks: int, churn: float,
+                 seed: int = 0) -> None:
+        self.clock = clock
+        self.churn = churn
+        self.random = random.Random(seed)
+        self.homeworks = make_homeworks('benchmark', homeworks)
+        self.updated = [clock.time()] * homeworks
+
+    def __call__(self, token: str, current_timestamp: int) -> Dict:
+        now = int(self.clock.time())
+        if self.homeworks and self.random.random() < self.churn:
+            index = self.random.randrange(len(self.homeworks))
+            self.homeworks[index]['status'] = self.random.choice(STATUSES)
+            self.updated[index] = now
+        return {
+            'homeworks': [
+                dict(hw) for hw, updated in zip(self.homeworks, self.updated)
+                if updated >= current_timestamp
+            ],
+            'current_date': now,
+        }
+
+
+def simulate(cycles: int, homeworks: int, churn: float,
+             seed: int = 0) -> VirtualClock:
+    """
+    Прогоняет main() `cycles` циклов во временном каталоге.
+    Смены статусов и разброс пауз задаются `seed`, так что
+    прогоны с одинаковыми параметрами повторяются точно.
+    """
+    saved = {name: getattr(homework, name) for name in PATCHED}
+    handlers = {signum: signal.getsignal(signum) for signum in SIGNALS}
+    clock = CycleClock(cycles, homework.STOP)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        homework.STOP.clear()
+        homework.CLOCK = clock
+        homework.CACHE = ErrorCache(clock=clock.monotonic)
+        homework.STATE = StateCache()
+        homework.SENDER = TelegramSender(
+            global_rate=10 ** 6, chat_rate=10 ** 6,
+            breaker=CircuitBreaker('telegram'),
+        )
+        homework.PRACTICUM_TOKEN = 'benchmark'
+        homework.TELEGRAM_TOKEN = '1:benchmark'
+        homework.TELEGRAM_CHAT_ID = '1'
+        homework.COMMANDS_ENABLED = False
+        homework.METRICS_PORT = 0
+        homework.make_bot = lambda token: NullBot()
+        homework.fetch_api_answer = SimulatedAPI(clock, homeworks, churn,
+                                                 seed)
+        homework.AdaptiveInterval = partial(
+            AdaptiveInterval, rand=random.Random(seed).random
+        )
+        try:
+            homework.main()
+        finally:
+            stop_logging()
+            os.chdir(cwd)
+            homework.STOP.clear()
+            for name, value in saved.items():
+                setattr(homework, name, value)
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+    return clock
+
+
+def run(cycles: int = 1000, homeworks: int = 5, churn: float = 0.05,
+        seed: int = 0) -> Dict[str, float]:
+    """
+    Два прогона: первый меряет процессорное время на цикл,
+    второй под tracemalloc — память, выделяемую и удерживаемую
+    за цикл. Возвращает сводку.
+    """
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    clock = simulate(cycles, homeworks, churn, seed)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    simulate(cycles, homeworks, churn, seed)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(
+        before, 'filename'
+    ))
+    return {
+        'cycles': clock.sleeps,
+        'simulated_hours': (clock.time() - clock.started) / 3600,
+        'wall_seconds': wall,
+        'cpu_us_per_cycle': cpu / clock.sleeps * 10 ** 6,
+        'peak_kb': peak / 1024,
+        'retained_bytes_per_cycle': retained / clock.sleeps,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Запускает бенчмарк из командной строки. С --max-cpu-us
+    возвращает код 1, если цикл стал дороже порога.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--cycles', type=int, default=2000)
+    parser.add_argument('--homeworks', type=int, default=5)
+    parser.add_argument('--churn', type=float, default=0.05,
+                        help='вероятность смены статуса за цикл')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='зерно смен статусов и разброса пауз')
+    parser.add_argument('--max-cpu-us', type=float,
+                        help='допустимое процессорное время цикла, мкс')
+    args = parser.parse_args(argv)
+    report = run(args.cycles, args.homeworks, args.churn, args.seed)
+    for key, value in report.items():
+        print(f'{key:>24}: {value:.2f}' if isinstance(value, float)
+              else f'{key:>24}: {value}')
+    if args.max_cpu_us and report['cpu_us_per_cycle'] > args.max_cpu_us:
+        print(f'Цикл дороже порога {args.max_cpu_us} мкс', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
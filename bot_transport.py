@@ -0,0 +1,53 @@
+"""Транспорт Bot API с пулом keep-alive соединений и замером задержек."""
+import logging
+import time
+from typing import Any
+
+from telegram import Bot
+from telegram.utils.request import Request
+
+from metrics import TELEGRAM_REQUEST_SECONDS
+from settings import (TELEGRAM_CONNECT_TIMEOUT, TELEGRAM_POOL_SIZE,
+                      TELEGRAM_READ_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+
+def api_method(url: str) -> str:
+    """Имя метода Bot API из URL запроса: .../bot<token>/sendMessage."""
+    return url.rstrip('/').rsplit('/', 1)[-1] or 'unknown'
+
+
+class PooledRequest(Request):
+    """
+    Запросы к Bot API через пул из `pool_size` keep-alive соединений.
+    Потоки отправки работают параллельно, каждый на своём соединении;
+    лишние ждут освобождения соединения, а не открывают новое.
+    Длительность каждого запроса попадает в метрики по методу.
+    """
+
+    def __init__(self, pool_size: int = TELEGRAM_POOL_SIZE,
+                 connect_timeout: float = TELEGRAM_CONNECT_TIMEOUT,
+                 read_timeout: float = TELEGRAM_READ_TIMEOUT,
+                 **kwargs: Any) -> None:
+        super().__init__(con_pool_size=pool_size,
+                         connect_timeout=connect_timeout,
+                         read_timeout=read_timeout, **kwargs)
+        pool_kw = getattr(self._con_pool, 'connection_pool_kw', None)
+        if pool_kw is not None:
+            pool_kw['block'] = True
+
+    def _request_wrapper(self, *args: Any, **kwargs: Any) -> bytes:
+        method = api_method(str(args[1])) if len(args) > 1 else 'unknown'
+        start = time.perf_counter()
+        try:
+            return super()._request_wrapper(*args, **kwargs)
+        finally:
+            TELEGRAM_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, method=method
+            )
+
+
+def make_bot(token: str, pool_size: int = TELEGRAM_POOL_SIZE) -> Bot:
+    """Создаёт бота с пулом соединений для исходящих сообщений."""
+    return Bot(token=token, request=PooledRequest(pool_size))
@@ -0,0 +1,110 @@
+"""Хранение курсора опроса API между перезапусками."""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def token_key(token: str) -> str:
+    """Возвращает ключ подписки, не раскрывающий сам токен."""
+    return hashlib.sha256(str(token).encode()).hexdigest()[:16]
+
+
+def atomic_write(path: str, data: str) -> None:
+    """
+    Атомарно записывает файл: сначала во временный файл рядом,
+    затем подменяет им исходный.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_snapshot(path: str, state: Dict[str, Any]) -> None:
+    """Сохраняет снимок состояния процесса для тёплого перезапуска."""
+    atomic_write(path, json.dumps(dict(state, saved=time.time())))
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    """
+    Читает снимок состояния; в поле `age` — сколько секунд
+    прошло с его записи. Без снимка возвращает пустой словарь.
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            state = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as err:
+        logger.error(f'Не удалось прочитать снимок {path}: {err}')
+        return {}
+    state['age'] = max(time.time() - state.get('saved', 0), 0.0)
+    return state
+
+
+class Checkpoint:
+    """
+    Курсоры `current_date` по подпискам в небольшом JSON-файле.
+    Изменения копятся в памяти и сбрасываются на диск в `flush()`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._cursors: Dict[str, int] = self._load()
+
+    def _load(self, path: Optional[str] = None) -> Dict[str, int]:
+        path = path or self.path
+        try:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            logger.error(f'Не удалось прочитать чекпоинт {path}: {err}')
+            return {}
+        return {key: int(value) for key, value in data.items()}
+
+    def merge(self, path: str) -> None:
+        """
+        Дополняет курсоры из другого файла, например чекпоинта
+        соседнего процесса; для каждой подписки берётся более поздний.
+        """
+        for key, value in self._load(path).items():
+            if value > (self._cursors.get(key) or 0):
+                self.set(key, value)
+
+    def get(self, key: str) -> Optional[int]:
+        """Возвращает сохранённый курсор подписки."""
+        return self._cursors.get(key)
+
+    def set(self, key: str, value: int) -> None:
+        """Запоминает новый курсор подписки."""
+        with self._lock:
+            if self._cursors.get(key) != value:
+                self._cursors[key] = value
+                self._dirty = True
+
+    def flush(self) -> None:
+        """Записывает изменённые курсоры на диск."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._cursors)
+            self._dirty = False
+        atomic_write(self.path, data)
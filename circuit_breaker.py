@@ -0,0 +1,110 @@
+"""Автоматические выключатели для внешних сервисов."""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from exeptions import CircuitOpenError
+from metrics import CIRCUIT_STATE
+from settings import BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    После `failure_threshold` сбоев подряд размыкается и сразу
+    отклоняет вызовы. Через `recovery_timeout` секунд пропускает
+    одну пробу: лёгкий запрос `probe`, а без него — очередной вызов.
+    Удачная проба замыкает цепь, неудачная снова размыкает.
+    """
+
+    def __init__(self, name: str,
+                 failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 recovery_timeout: float = BREAKER_RECOVERY_TIMEOUT,
+                 probe: Optional[Callable[[], bool]] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.probe = probe
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = CLOSED
+        self._probing = False
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.set(STATE_CODES[CLOSED], name=name)
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            logger.warning(f'Выключатель {self.name}: {self._state} -> {state}')
+            self._state = state
+            CIRCUIT_STATE.set(STATE_CODES[state], name=self.name)
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние с учётом истёкшего таймаута."""
+        with self._lock:
+            if (self._state == OPEN and self.clock() - self.opened_at
+                    >= self.recovery_timeout):
+                self._set_state(HALF_OPEN)
+            return self._state
+
+    def remaining(self) -> float:
+        """Сколько секунд осталось до пробы."""
+        return max(self.opened_at + self.recovery_timeout - self.clock(), 0)
+
+    def before_call(self) -> None:
+        """
+        Проверяет, можно ли обращаться к сервису.
+        Поднимает CircuitOpenError, если цепь разомкнута
+        или проба уже выполняется другим вызовом; во втором случае
+        повторить предлагается через `recovery_timeout`.
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        with self._lock:
+            if state == OPEN:
+                raise CircuitOpenError(self.name, self.remaining())
+            if self._probing:
+                # Проба может идти до таймаута запроса; ноль заставил бы
+                # остальных вызывающих повторять без паузы.
+                raise CircuitOpenError(self.name, self.recovery_timeout)
+            self._probing = True
+        if self.probe is None:
+            return
+        try:
+            healthy = self.probe()
+        except Exception as error:
+            logger.debug(f'Проба {self.name} не удалась: {error}')
+            healthy = False
+        if healthy:
+            self.record_success()
+        else:
+            self.record_failure()
+            raise CircuitOpenError(self.name, self.remaining())
+
+    def record_success(self) -> None:
+        """Учитывает удачный вызов."""
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """Учитывает сбой сервиса."""
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN or (
+                self.failures >= self.failure_threshold
+            ):
+                self.opened_at = self.clock()
+                self._probing = False
+                self._set_state(OPEN)
@@ -0,0 +1,59 @@
+"""Часы и ожидание, которые можно подменить в тестах и бенчмарках."""
+import threading
+import time
+from typing import Optional
+
+
+class SystemClock:
+    """Настоящие часы процесса."""
+
+    def time(self) -> float:
+        """Текущее время в секундах эпохи Unix."""
+        return time.time()
+
+    def monotonic(self) -> float:
+        """Монотонное время для измерения интервалов."""
+        return time.monotonic()
+
+    def sleep(self, seconds: float,
+              stop: Optional[threading.Event] = None) -> bool:
+        """
+        Ждёт `seconds` секунд. Если передано событие `stop`,
+        ожидание прерывается им; True — если прервали.
+        """
+        if stop is None:
+            time.sleep(seconds)
+            return False
+        return stop.wait(seconds)
+
+
+class VirtualClock(SystemClock):
+    """
+    Симулированные часы: `sleep` не ждёт, а сдвигает время вперёд.
+    Тысячи циклов с паузой в RETRY_TIME проходят мгновенно.
+    """
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        self.now = time.time() if start is None else start
+        self.started = self.now
+        self.sleeps = 0
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now - self.started
+
+    def advance(self, seconds: float) -> None:
+        """Сдвигает время вперёд."""
+        with self._lock:
+            self.now += max(seconds, 0.0)
+
+    def sleep(self, seconds: float,
+              stop: Optional[threading.Event] = None) -> bool:
+        if stop is not None and stop.is_set():
+            return True
+        self.sleeps += 1
+        self.advance(seconds)
+        return stop is not None and stop.is_set()
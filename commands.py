@@ -0,0 +1,73 @@
+"""Команды бота /status и /history, отвечающие из кэша состояния."""
+import logging
+import time
+from typing import List
+
+from telegram import Update
+from telegram.ext import CallbackContext, CommandHandler, Updater
+
+from settings import COMMANDS_POLL_TIMEOUT, HOMEWORK_STATUSES
+from state_cache import Entry, StateCache
+
+logger = logging.getLogger(__name__)
+
+NO_DATA = 'Пока нет данных о домашних работах.'
+
+
+def format_time(timestamp: float) -> str:
+    """Форматирует момент наблюдения."""
+    return time.strftime('%d.%m.%Y %H:%M', time.localtime(timestamp))
+
+
+def format_status(entries: List[Entry]) -> str:
+    """Текст ответа на /status."""
+    if not entries:
+        return NO_DATA
+    return '\n'.join(
+        f'"{entry.name}": '
+        f'{HOMEWORK_STATUSES.get(entry.status, entry.status)}'
+        for entry in entries
+    )
+
+
+def format_history(entries: List[Entry]) -> str:
+    """Текст ответа на /history."""
+    if not entries:
+        return NO_DATA
+    return '\n'.join(
+        f'{format_time(entry.observed)} "{entry.name}": {entry.status}'
+        for entry in entries
+    )
+
+
+def status_command(update: Update, context: CallbackContext) -> None:
+    """Отвечает на /status последними статусами работ чата."""
+    state: StateCache = context.bot_data['state']
+    update.effective_message.reply_text(
+        format_status(state.latest(update.effective_chat.id))
+    )
+
+
+def history_command(update: Update, context: CallbackContext) -> None:
+    """Отвечает на /history историей смен статусов чата."""
+    state: StateCache = context.bot_data['state']
+    update.effective_message.reply_text(
+        format_history(state.history(update.effective_chat.id))
+    )
+
+
+def start_commands(token: str, state: StateCache) -> Updater:
+    """
+    Запускает приём команд через long polling getUpdates
+    в фоновых потоках python-telegram-bot.
+    """
+    updater = Updater(token=token, use_context=True)
+    updater.dispatcher.bot_data['state'] = state
+    updater.dispatcher.add_handler(CommandHandler('status', status_command))
+    updater.dispatcher.add_handler(
+        CommandHandler('history', history_command)
+    )
+    updater.start_polling(timeout=COMMANDS_POLL_TIMEOUT,
+                          drop_pending_updates=True)
+    logger.info('Бот принимает команды /status и /history')
+    return updater
@@ -0,0 +1,288 @@
+"""Очередь исходящих сообщений и пул потоков, которые её разбирают."""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from telegram import Bot
+
+from exeptions import (BotException, CircuitOpenError, TelegramFloodError,
+                       TransientNetworkError)
+from settings import (DELIVERY_MAX_BATCH, DELIVERY_OVERFLOW,
+                      DELIVERY_QUEUE_SIZE, DELIVERY_RETRY_INITIAL,
+                      DELIVERY_RETRY_MAX, DELIVERY_WORKERS)
+
+logger = logging.getLogger(__name__)
+
+ChatId = Union[int, str]
+SendFunc = Callable[[Bot, ChatId, List[str]], Any]
+AckFunc = Callable[[List[int]], Any]
+
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+STOP = object()
+# Сбои, после которых отправку стоит повторить: сообщения
+# возвращаются в очередь, а не теряются до перезапуска.
+# Разомкнутый выключатель откладывает отправку до своей пробы.
+RETRIABLE = (TransientNetworkError, TelegramFloodError, CircuitOpenError)
+
+
+class DeliveryQueue:
+    """
+    Ограниченная очередь отправки, развязывающая опрос API и Telegram.
+    Сообщения одному чату склеиваются в одну запись; при переполнении
+    по политике DROP_OLDEST вытесняется самая старая запись, по BLOCK —
+    отправитель ждёт `put_timeout` секунд и только потом вытесняет.
+    Один чат в каждый момент обслуживает только один поток,
+    так что порядок сообщений в чате сохраняется.
+    После успешной отправки идентификаторы сообщений
+    передаются в `on_delivered`, а сообщений, которые уже не будут
+    доставлены (отказ Telegram, вытеснение, обрезка пачки), —
+    в `on_failed`. После временного сбоя пачка
+    возвращается в начало очереди чата и ждёт retry_after ошибки
+    или паузы, удваивающейся с каждой неудачей подряд.
+    """
+
+    def __init__(self, send: SendFunc, workers: int = DELIVERY_WORKERS,
+                 maxsize: int = DELIVERY_QUEUE_SIZE,
+                 max_batch: int = DELIVERY_MAX_BATCH,
+                 overflow: str = DELIVERY_OVERFLOW,
+                 put_timeout: float = 5.0,
+                 on_delivered: Optional[AckFunc] = None,
+                 on_failed: Optional[AckFunc] = None,
+                 retry_initial: float = DELIVERY_RETRY_INITIAL,
+                 retry_max: float = DELIVERY_RETRY_MAX,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if overflow not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f'Неизвестная политика переполнения {overflow}')
+        self.send = send
+        self.workers = workers
+        self.maxsize = maxsize
+        self.max_batch = max_batch
+        self.overflow = overflow
+        self.put_timeout = put_timeout
+        self.on_delivered = on_delivered
+        self.on_failed = on_failed
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.clock = clock
+        self._pending: 'OrderedDict[ChatId, Tuple[Bot, List[str], List]]' = (
+            OrderedDict()
+        )
+        self._in_flight = set()
+        self._retry_at: Dict[ChatId, float] = {}
+        self._attempts: Dict[ChatId, int] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.high_watermark = 0
+
+    def start(self) -> 'DeliveryQueue':
+        """Запускает потоки отправки."""
+        with self._cond:
+            self._running = True
+        for number in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f'delivery-{number}', daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def put(self, bot: Bot, chat_id: ChatId, messages: List[str],
+            ids: Optional[List[int]] = None) -> None:
+        """
+        Ставит сообщения чату в очередь, не дожидаясь отправки.
+        `ids` — идентификаторы сообщений для подтверждения доставки.
+        """
+        ids = list(ids) if ids is not None else [None] * len(messages)
+        with self._cond:
+            lost = self._put(bot, chat_id, messages, ids)
+        self._notify(self.on_failed, lost)
+
+    def _put(self, bot: Bot, chat_id: ChatId, messages: List[str],
+             ids: List[Optional[int]]) -> List[Optional[int]]:
+        """Ставит сообщения под замком; возвращает id отброшенных."""
+        self.enqueued += len(messages)
+        if chat_id in self._pending:
+            self.coalesced += len(messages)
+            return self._extend(chat_id, messages, ids)
+        if len(self._pending) >= self.maxsize and self.overflow == BLOCK:
+            self._cond.wait_for(
+                lambda: len(self._pending) < self.maxsize,
+                timeout=self.put_timeout,
+            )
+        lost_ids = []
+        while len(self._pending) >= self.maxsize:
+            lost_chat, (_, lost, old_ids) = self._pending.popitem(
+                last=False
+            )
+            self._retry_at.pop(lost_chat, None)
+            self.dropped += len(lost)
+            lost_ids.extend(old_ids)
+            logger.warning(
+                f'Очередь отправки переполнена, '
+                f'отброшено сообщений: {len(lost)}'
+            )
+        self._pending[chat_id] = (bot, [], [])
+        lost_ids.extend(self._extend(chat_id, messages, ids))
+        self.high_watermark = max(self.high_watermark, len(self._pending))
+        self._cond.notify_all()
+        return lost_ids
+
+    def _extend(self, chat_id: ChatId, messages: List[str],
+                ids: List[Optional[int]]) -> List[Optional[int]]:
+        """Дописывает сообщения в пачку; возвращает id обрезанных."""
+        _, batch, batch_ids = self._pending[chat_id]
+        batch.extend(messages)
+        batch_ids.extend(ids)
+        if len(batch) <= self.max_batch:
+            return []
+        self.dropped += len(batch) - self.max_batch
+        lost_ids = batch_ids[:-self.max_batch]
+        del batch[:-self.max_batch]
+        del batch_ids[:-self.max_batch]
+        return lost_ids
+
+    def _notify(self, callback: Optional[AckFunc],
+                ids: List[Optional[int]]) -> None:
+        """Передаёт в `callback` идентификаторы журнала, если они есть."""
+        numbers = [number for number in ids if number is not None]
+        if not numbers or callback is None:
+            return
+        try:
+            callback(numbers)
+        except Exception as error:
+            logger.exception(f'Не удалось отметить исход доставки: {error}')
+
+    def _take(self) -> Any:
+        """
+        Забирает запись для свободного чата, чья пауза повтора истекла;
+        STOP — если отправлять нечего и потоки остановлены;
+        None — если пока нечего отправлять.
+        """
+        now = self.clock()
+        for chat_id in self._pending:
+            if (chat_id not in self._in_flight
+                    and self._retry_at.get(chat_id, now) <= now):
+                bot, messages, ids = self._pending.pop(chat_id)
+                self._retry_at.pop(chat_id, None)
+                self._in_flight.add(chat_id)
+                return chat_id, bot, messages, ids
+        return None if self._running else STOP
+
+    def _next_retry(self) -> Optional[float]:
+        """Сколько ждать ближайшего повтора; None — повторов нет."""
+        waiting = [
+            retry_at for chat_id, retry_at in self._retry_at.items()
+            if chat_id in self._pending
+        ]
+        if not waiting:
+            return None
+        return max(min(waiting) - self.clock(), 0.0)
+
+    def _retry_delay(self, chat_id: ChatId, error: BotException) -> float:
+        """Пауза перед повтором: retry_after ошибки или удвоение."""
+        attempts = self._attempts.get(chat_id, 0) + 1
+        self._attempts[chat_id] = attempts
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after:
+            return float(retry_after)
+        return min(self.retry_initial * 2 ** (attempts - 1), self.retry_max)
+
+    def _requeue(self, chat_id: ChatId, bot: Bot, messages: List[str],
+                 ids: List, error: BotException) -> None:
+        """Возвращает пачку в начало очереди чата до повтора."""
+        with self._cond:
+            delay = self._retry_delay(chat_id, error)
+            self.retried += len(messages)
+            if chat_id in self._pending:
+                _, newer, newer_ids = self._pending[chat_id]
+                messages, ids = messages + newer, ids + newer_ids
+            self._pending[chat_id] = (bot, messages, ids)
+            self._retry_at[chat_id] = self.clock() + delay
+            logger.warning(f'Повтор отправки в чат {chat_id} '
+                           f'через {delay:.0f} с: {error}')
+
+    def _give_up(self, chat_id: ChatId, messages: List[str],
+                 ids: List) -> None:
+        """Учитывает пачку, которую повторять бесполезно."""
+        with self._cond:
+            self.failed += len(messages)
+            self._attempts.pop(chat_id, None)
+        self._notify(self.on_failed, ids)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                item = self._take()
+                while item is None:
+                    self._cond.wait(self._next_retry())
+                    item = self._take()
+                if item is STOP:
+                    return
+                chat_id, bot, messages, ids = item
+                self._cond.notify_all()
+            try:
+                self.send(bot, chat_id, messages)
+            except RETRIABLE as error:
+                self._requeue(chat_id, bot, messages, ids, error)
+            except BotException as error:
+                logger.error(f'Не удалось доставить сообщения: {error}')
+                self._give_up(chat_id, messages, ids)
+            except Exception as error:
+                logger.exception(f'Сбой потока отправки: {error}')
+                self._give_up(chat_id, messages, ids)
+            else:
+                with self._cond:
+                    self.delivered += len(messages)
+                    self._attempts.pop(chat_id, None)
+                self._notify(self.on_delivered, ids)
+            finally:
+                with self._cond:
+                    self._in_flight.discard(chat_id)
+                    self._cond.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Ждёт, пока очередь опустеет. False — если не дождались."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight,
+                timeout=timeout,
+            )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Дожидается отправки очереди и останавливает потоки."""
+        self.join(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает глубину очереди и счётчики."""
+        with self._cond:
+            return {
+                'depth': len(self._pending),
+                'pending_messages': sum(
+                    len(messages)
+                    for _, messages, _ in self._pending.values()
+                ),
+                'in_flight': len(self._in_flight),
+                'high_watermark': self.high_watermark,
+                'enqueued': self.enqueued,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'delivered': self.delivered,
+                'failed': self.failed,
+                'retried': self.retried,
+            }
@@ -0,0 +1,323 @@
+"""Асинхронный движок опроса API Практикума для множества подписок."""
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+
+from dotenv import load_dotenv
+from telegram import Bot
+
+import homework
+from bot_transport import make_bot
+from checkpoint import Checkpoint, load_snapshot, save_snapshot, token_key
+from commands import start_commands
+from error_cache import ErrorCache
+from exeptions import BotException, retry_policy
+from http_client import PracticumClient
+from log_config import setup_logging
+from metrics import ERRORS, POLL_LAG, start_http_server
+from polling import AdaptiveInterval
+from scheduler import Scheduler
+from settings import (CHECKPOINT_FILE, CHECKPOINT_INTERVAL,
+                      COMMANDS_ENABLED, ENGINE_CONCURRENCY, METRICS_PORT,
+                      OUTBOX_FILE, STATE_FILE,
+                      SUBSCRIPTION_ERROR_CACHE_SIZE, TIMELINE_FILE)
+from status_index import StatusIndex
+from timeline import Timeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Subscription:
+    """Подписка: токен Практикума и чат, куда уходят статусы."""
+
+    token: str
+    chat_id: Union[int, str]
+    errors: ErrorCache = field(
+        default_factory=lambda: ErrorCache(SUBSCRIPTION_ERROR_CACHE_SIZE),
+        repr=False,
+    )
+    statuses: StatusIndex = field(default_factory=StatusIndex, repr=False)
+
+    def remember_error(self, message: str) -> bool:
+        """Запоминает ошибку подписки, True — если она новая."""
+        return self.errors.add(message)
+
+
+@dataclass
+class Feed:
+    """
+    Все подписки на один токен: API опрашивается один раз,
+    ответ расходится по чатам подписчиков.
+    """
+
+    token: str
+    subscriptions: List[Subscription] = field(default_factory=list)
+    timestamp: Optional[int] = None
+    interval: AdaptiveInterval = field(
+        default_factory=AdaptiveInterval, repr=False
+    )
+    statuses: StatusIndex = field(default_factory=StatusIndex, repr=False)
+
+
+def group_feeds(subscriptions: Iterable[Subscription]) -> List[Feed]:
+    """Группирует подписки по токену, сохраняя порядок."""
+    feeds: Dict[str, Feed] = {}
+    for sub in subscriptions:
+        feeds.setdefault(sub.token, Feed(sub.token)).subscriptions.append(sub)
+    return list(feeds.values())
+
+
+class PollingEngine:
+    """
+    Опрашивает API для всех подписок в одном событийном цикле.
+    Подписки с одним токеном опрашиваются одним запросом.
+    Блокирующие запросы выполняются в общем пуле потоков,
+    одновременно в работе не больше `concurrency` запросов.
+    Расписание идёт по часам `clock`, по умолчанию — часам
+    событийного цикла.
+    """
+
+    def __init__(self, bot: Bot, subscriptions: Iterable[Subscription],
+                 concurrency: int = ENGINE_CONCURRENCY,
+                 checkpoint: Optional[Checkpoint] = None,
+                 timeline: Optional[Timeline] = None,
+                 clock: Optional[Callable[[], float]] = None) -> None:
+        self.bot = bot
+        self.subscriptions = list(subscriptions)
+        self.feeds = group_feeds(self.subscriptions)
+        self.concurrency = concurrency
+        self.checkpoint = checkpoint
+        self.timeline = timeline
+        self.clock = clock
+        if checkpoint is not None:
+            for feed in self.feeds:
+                feed.timestamp = checkpoint.get(token_key(feed.token))
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphore = None
+        self._wakeup = None
+        self._running: Set[asyncio.Future] = set()
+        self.schedule: Optional[Scheduler] = None
+
+    async def _call(self, func, *args):
+        """Выполняет блокирующую функцию в пуле потоков."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def poll(self, feed: Feed) -> float:
+        """
+        Один цикл опроса токена: запрос, проверка и рассылка
+        изменений всем подписчикам. Возвращает паузу до следующего
+        опроса.
+        """
+        async with self._semaphore:
+            response = await self._call(
+                homework.fetch_coalesced, feed.token, feed.timestamp
+            )
+        list_hw = homework.check_response(response)
+        for sub in feed.subscriptions:
+            changed = sub.statuses.changed(list_hw)
+            messages = [homework.parse_status(hw) for hw in changed]
+            if messages:
+                await self._call(
+                    homework.deliver_messages, self.bot, sub.chat_id,
+                    messages
+                )
+            for hw in changed:
+                sub.statuses.remember(hw)
+            homework.STATE.update(sub.chat_id, list_hw)
+        if self.timeline is not None:
+            recorded = feed.statuses.changed(list_hw)
+            if recorded:
+                await self._call(self.timeline.append, feed.token, recorded)
+            for hw in recorded:
+                feed.statuses.remember(hw)
+        feed.timestamp = homework.get_current_date(
+            response, feed.timestamp or int(time.time())
+        )
+        if self.checkpoint is not None:
+            self.checkpoint.set(token_key(feed.token), feed.timestamp)
+        homework.commit_answer(feed.token)
+        return feed.interval.on_result(list_hw)
+
+    async def notify_error(self, feed: Feed, message: str) -> None:
+        """Сообщает об ошибке подписчикам, которые её ещё не видели."""
+        for sub in feed.subscriptions:
+            if not sub.remember_error(message):
+                continue
+            try:
+                await self._call(
+                    homework.deliver_message, self.bot, sub.chat_id,
+                    message
+                )
+            except BotException as send_error:
+                logger.error(send_error)
+
+    async def run_feed(self, number: int, due: float) -> None:
+        """Опрашивает токен и назначает ему следующий срок."""
+        feed = self.feeds[number]
+        POLL_LAG.set(max(self.schedule.clock() - due, 0.0))
+        try:
+            with homework.PROFILER.iteration():
+                delay = await self.poll(feed)
+        except Exception as error:
+            ERRORS.inc(type=type(error).__name__)
+            policy = retry_policy(error)
+            delay = feed.interval.on_error(
+                getattr(error, 'retry_after', None), policy
+            )
+            message = f'Сбой в работе программы: {error}'
+            logger.error(message)
+            await self.notify_error(feed, message)
+            if policy.fatal:
+                logger.critical(
+                    f'Опрос токена {token_key(feed.token)} остановлен: '
+                    f'повторы не помогут'
+                )
+                return
+        following = self.schedule.reschedule(number, due, delay)
+        if following <= (self.schedule.next_due() or following):
+            self._wakeup.set()
+
+    async def dispatch(self) -> None:
+        """
+        Запускает опросы по расписанию: ждёт ближайшего срока
+        и стартует все наступившие, не дожидаясь их завершения.
+        """
+        while True:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(),
+                                       self.schedule.wait_time())
+            except asyncio.TimeoutError:
+                pass
+            for number, due in self.schedule.pop_due():
+                task = asyncio.ensure_future(self.run_feed(number, due))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def flush_checkpoint(self) -> None:
+        """Периодически сохраняет курсоры подписок на диск."""
+        while True:
+            await asyncio.sleep(CHECKPOINT_INTERVAL)
+            try:
+                await self._call(self.checkpoint.flush)
+            except OSError as error:
+                logger.error(f'Не удалось сохранить чекпоинт: {error}')
+
+    def _start_schedule(self) -> None:
+        """Раскладывает первые опросы токенов по интервалу."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self.schedule = Scheduler(
+            clock=self.clock or asyncio.get_event_loop().time
+        )
+        self.schedule.spread(
+            range(len(self.feeds)),
+            min((feed.interval.current for feed in self.feeds), default=0),
+        )
+
+    async def run(self) -> None:
+        """
+        Запускает опрос всех подписок: первые опросы равномерно
+        разложены по интервалу, дальше каждый токен идёт
+        со своим фиксированным темпом.
+        """
+        self._start_schedule()
+        logger.info(f'Запущен опрос подписок: {len(self.subscriptions)}, '
+                    f'токенов: {len(self.feeds)}')
+        tasks = [self.dispatch()]
+        if self.checkpoint is not None:
+            tasks.append(self.flush_checkpoint())
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in list(self._running):
+                task.cancel()
+            if self.checkpoint is not None:
+                self.checkpoint.flush()
+            self._executor.shutdown(wait=False)
+
+    def close(self) -> None:
+        """Дожидается запросов, которые ещё выполняются в пуле потоков."""
+        self._executor.shutdown(wait=True)
+
+
+def load_subscriptions(path: Optional[str]) -> List[Subscription]:
+    """
+    Загружает подписки из JSON-файла вида
+    [{"token": "...", "chat_id": 123}, {"token": "...", "chat_ids": [1, 2]}].
+    Без файла возвращает подписки из переменных окружения,
+    TELEGRAM_CHAT_ID может содержать несколько чатов через запятую.
+    """
+    if path:
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        return [
+            Subscription(item['token'], chat_id)
+            for item in data
+            for chat_id in item.get('chat_ids') or [item['chat_id']]
+        ]
+    return [
+        Subscription(homework.PRACTICUM_TOKEN, chat_id)
+        for chat_id in homework.parse_chat_ids(homework.TELEGRAM_CHAT_ID)
+    ] or [Subscription(homework.PRACTICUM_TOKEN, None)]
+
+
+def run(telegram_token: str, subscriptions: List[Subscription],
+        checkpoint: Checkpoint, metrics_port: int = METRICS_PORT,
+        commands: bool = COMMANDS_ENABLED,
+        outbox_path: str = OUTBOX_FILE,
+        timeline_path: str = TIMELINE_FILE,
+        state_path: str = STATE_FILE) -> None:
+    """
+    Поднимает клиент, очередь отправки и опрашивает подписки.
+    Статусы для команд восстанавливаются из `state_path`
+    и сохраняются туда при остановке.
+    """
+    bot = make_bot(telegram_token)
+    homework.STATE.restore(load_snapshot(state_path).get('state', {}))
+    homework.CLIENT = PracticumClient(pool_size=ENGINE_CONCURRENCY)
+    homework.start_delivery(bot, outbox_path)
+    if metrics_port:
+        start_http_server(metrics_port)
+    updater = None
+    if commands:
+        updater = start_commands(telegram_token, homework.STATE)
+    homework.start_profiling()
+    engine = PollingEngine(bot, subscriptions, checkpoint=checkpoint,
+                           timeline=Timeline(timeline_path))
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        logger.info('Получен сигнал остановки')
+    finally:
+        if updater is not None:
+            updater.stop()
+        homework.stop_delivery()
+        save_snapshot(state_path, {'state': homework.STATE.snapshot()})
+        logger.info('Движок остановлен')
+
+
+def main() -> None:
+    """Запускает асинхронный опрос всех подписок."""
+    setup_logging()
+    load_dotenv()
+    telegram_token = os.getenv('TELEGRAM_TOKEN')
+    subscriptions = load_subscriptions(os.getenv('SUBSCRIPTIONS_FILE'))
+    if not telegram_token or not all(
+        sub.token and sub.chat_id for sub in subscriptions
+    ):
+        raise BotException('Проверьте переменные окружения!')
+    run(telegram_token, subscriptions, Checkpoint(CHECKPOINT_FILE))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Ограниченный кэш ошибок для подавления повторных уведомлений."""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from metrics import CACHE_HITS, CACHE_MISSES
+from settings import ERROR_CACHE_SIZE, ERROR_CACHE_TTL
+
+# URL и query-строки, даты-время ISO, метки времени Unix и адреса
+# объектов из ошибок requests/urllib3. Короткие числа вроде кода
+# ответа API остаются: по ним различаются ошибки.
+VOLATILE = re.compile(
+    r'https?://\S+'
+    r'|\?[^\s\'")]+'
+    r'|\b0x[0-9a-fA-F]+\b'
+    r'|\d{4}-\d\d-\d\d[T ]\d\d:\d\d(?::\d\d(?:\.\d+)?)?(?:Z|[+-]\d\d:?\d\d)?'
+    r'|\b\d{9,}(?:\.\d+)?\b'
+)
+SPACES = re.compile(r'\s+')
+
+
+def fingerprint(message: str) -> str:
+    """
+    Возвращает отпечаток ошибки.
+    URL, метки времени и адреса заменены, пробелы схлопнуты,
+    результат захеширован.
+    """
+    normalized = SPACES.sub(' ', VOLATILE.sub('#', message)).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+class ErrorCache:
+    """
+    Кэш отпечатков ошибок с TTL и вытеснением по LRU.
+    Ошибка снова считается новой, когда истёк её TTL
+    или она была вытеснена более свежими.
+    """
+
+    def __init__(self, maxsize: int = ERROR_CACHE_SIZE,
+                 ttl: float = ERROR_CACHE_TTL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._items: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, message: str) -> bool:
+        """Запоминает ошибку. True — если о ней нужно сообщить."""
+        key = fingerprint(message)
+        now = self.clock()
+        with self._lock:
+            expires = self._items.get(key)
+            if expires is not None and expires > now:
+                self.hits += 1
+                CACHE_HITS.inc()
+                self._items.move_to_end(key)
+                return False
+            self.misses += 1
+            CACHE_MISSES.inc()
+            self._items[key] = now + self.ttl
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+            return True
+
+    def snapshot(self) -> Dict[str, float]:
+        """Живые отпечатки и оставшийся TTL (с) в порядке LRU."""
+        now = self.clock()
+        with self._lock:
+            return {
+                key: expires - now for key, expires in self._items.items()
+                if expires > now
+            }
+
+    def restore(self, items: Dict[str, float], age: float = 0.0) -> None:
+        """Восстанавливает отпечатки из снимка, сделанного `age` с назад."""
+        now = self.clock()
+        with self._lock:
+            for key, left in items.items():
+                if left > age:
+                    self._items[key] = now + left - age
+                    self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __contains__(self, message: str) -> bool:
+        expires = self._items.get(fingerprint(message))
+        return expires is not None and expires > self.clock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        with self._lock:
+            self._items.clear()
@@ -1,3 +1,84 @@
+from typing import NamedTuple
+
+from settings import NETWORK_RETRY, PAYLOAD_RETRY, UPSTREAM_RETRY
+
+
+class RetryPolicy(NamedTuple):
+    """
+    Как опрашивать после ошибки: `attempts` быстрых повторов
+    с паузой от `initial` до `maximum` секунд, растущей в `factor` раз,
+    дальше — обычный интервал. `fatal` — опрос прекращается.
+    """
+
+    initial: float = 0.0
+    factor: float = 2.0
+    maximum: float = 0.0
+    attempts: int = 0
+    fatal: bool = False
+
+
+REGULAR = RetryPolicy()
+FATAL = RetryPolicy(fatal=True)
+
+
+def retry_policy(error: BaseException) -> RetryPolicy:
+    """Политика повтора для любой ошибки; по умолчанию — обычная."""
+    return getattr(error, 'retry_policy', REGULAR)
+
+
 class BotException(Exception):
     """Ошибка для вывода Бота."""
-    pass
+
+    retry_policy = REGULAR
+
+
+class TransientNetworkError(BotException):
+    """Сбой сети: соединение, таймаут. Проходит за секунды."""
+
+    retry_policy = RetryPolicy(*NETWORK_RETRY)
+
+
+class MalformedPayloadError(BotException, TypeError):
+    """Ответ API не того формата: не JSON, нет ключей, не те типы."""
+
+    retry_policy = RetryPolicy(*PAYLOAD_RETRY)
+
+
+class ApiResponseError(BotException):
+    """API ответило кодом, отличным от 200."""
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class UpstreamServerError(ApiResponseError):
+    """API ответило кодом 5xx."""
+
+    retry_policy = RetryPolicy(*UPSTREAM_RETRY)
+
+
+class AuthError(ApiResponseError):
+    """Токен отклонён: повторы не помогут, опрос прекращается."""
+
+    retry_policy = FATAL
+
+
+class TelegramFloodError(BotException):
+    """Telegram не принял сообщение из-за флуд-контроля."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(BotException):
+    """Выключатель сервиса разомкнут, обращение не выполнялось."""
+
+    def __init__(self, name, retry_after=None):
+        super().__init__(
+            f'Сервис {name} временно недоступен, обращения приостановлены.'
+        )
+        self.name = name
+        self.retry_after = retry_after
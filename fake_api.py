@@ -0,0 +1,191 @@
+"""Локальная замена API статусов домашних работ Практикума."""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+PATH = '/api/user_api/homework_statuses/'
+STATUSES = ('reviewing', 'approved', 'rejected')
+
+
+def make_homeworks(token: str, count: int) -> List[Dict[str, object]]:
+    """Генерирует `count` домашних работ для токена."""
+    rng = random.Random(token)
+    return [
+        {
+            'id': rng.randrange(1, 10 ** 9),
+            'status': rng.choice(STATUSES),
+            'homework_name': f'{token}__hw{number}.zip',
+            'reviewer_comment': 'Комментарий ревьюера. ' * 3,
+            'date_updated': '2022-01-01T10:00:00Z',
+            'lesson_name': f'Спринт {number}',
+        }
+        for number in range(count)
+    ]
+
+
+class FakePracticumAPI:
+    """
+    Настройки и данные заглушки: задержка ответа, доля ошибок,
+    число работ в ответе и работы по конкретным токенам.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, homeworks: int = 1,
+                 data: Optional[Dict[str, List[Dict]]] = None,
+                 seed: Optional[int] = None, etag: bool = False) -> None:
+        self.latency = latency
+        self.etag = etag
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.homeworks = homeworks
+        self.data = data or {}
+        self.random = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def homeworks_for(self, token: str) -> List[Dict]:
+        """Работы токена: заданные явно или сгенерированные."""
+        with self._lock:
+            if token not in self.data:
+                self.data[token] = make_homeworks(token, self.homeworks)
+            return self.data[token]
+
+    def answer(self, token: Optional[str]) -> Tuple[int, Dict]:
+        """Возвращает код и тело ответа на запрос токена."""
+        with self._lock:
+            self.requests += 1
+            failed = self.random.random() < self.error_rate
+            delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        if not token:
+            return HTTPStatus.UNAUTHORIZED, {'code': 'not_authenticated'}
+        if failed:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'code': 'error'}
+        return HTTPStatus.OK, {
+            'homeworks': self.homeworks_for(token),
+            'current_date': int(time.time()),
+        }
+
+
+class FakePracticumHandler(BaseHTTPRequestHandler):
+    """Обрабатывает GET-запросы к эндпоинту статусов."""
+
+    api: FakePracticumAPI = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != PATH:
+            self._reply(HTTPStatus.NOT_FOUND, {'code': 'not_found'})
+            return
+        if 'from_date' in parse_qs(url.query):
+            auth = self.headers.get('Authorization', '')
+            token = auth[len('OAuth '):] if auth.startswith('OAuth ') else ''
+            self._reply(*self.api.answer(token),
+                        if_none_match=self.headers.get('If-None-Match'))
+        else:
+            self._reply(HTTPStatus.BAD_REQUEST, {'code': 'UnknownError'})
+
+    def do_HEAD(self) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _reply(self, status: int, data: Dict,
+               if_none_match: Optional[str] = None) -> None:
+        etag = None
+        if self.api.etag and status == HTTPStatus.OK:
+            homeworks = json.dumps(data['homeworks']).encode('utf-8')
+            etag = f'"{hashlib.md5(homeworks).hexdigest()}"'
+            if etag == if_none_match:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class FakePracticumServer(ThreadingHTTPServer):
+    """HTTP-сервер заглушки, работающий в фоновом потоке."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, api: FakePracticumAPI, host: str = '127.0.0.1',
+                 port: int = 0) -> None:
+        handler = type('Handler', (FakePracticumHandler,), {'api': api})
+        super().__init__((host, port), handler)
+        self.api = api
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """Полный URL эндпоинта статусов."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}{PATH}'
+
+    def start(self) -> 'FakePracticumServer':
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(target=self.serve_forever,
+                                        name='fake-api', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        self.shutdown()
+        self.server_close()
+
+
+def main() -> None:
+    """Запускает заглушку API из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='задержка ответа, с')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='случайная добавка к задержке, с')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='доля ответов 500')
+    parser.add_argument('--homeworks', type=int, default=1,
+                        help='работ в ответе на токен')
+    parser.add_argument('--data', help='JSON-файл {token: [homework, ...]}')
+    parser.add_argument('--etag', action='store_true',
+                        help='отдавать ETag и отвечать 304')
+    args = parser.parse_args()
+    data = None
+    if args.data:
+        with open(args.data, encoding='utf-8') as file:
+            data = json.load(file)
+    api = FakePracticumAPI(args.latency, args.jitter, args.error_rate,
+                           args.homeworks, data, etag=args.etag)
+    server = FakePracticumServer(api, args.host, args.port)
+    print(f'Заглушка API: {server.endpoint}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
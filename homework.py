@@ -1,17 +1,50 @@
+import importlib
 import logging
 import os
-import time
+import signal
+import threading
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
 from http import HTTPStatus
-from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional, Type, Union
 
 import requests
-import telegram
 from dotenv import load_dotenv
 from telegram import Bot
+from telegram.ext import Updater
 
-from exeptions import BotException
-from settings import (ENDPOINT, HOMEWORK_STATUSES, RETRY_TIME, CustomDict,
-                      CustomList)
+import settings
+from bot_transport import make_bot
+from checkpoint import Checkpoint, load_snapshot, save_snapshot, token_key
+from circuit_breaker import CircuitBreaker
+from clock import SystemClock
+from commands import start_commands
+from delivery import DeliveryQueue
+from error_cache import ErrorCache
+from exeptions import (ApiResponseError, AuthError, BotException,
+                       MalformedPayloadError, TransientNetworkError,
+                       UpstreamServerError, retry_policy)
+from http_client import PracticumClient
+from json_backend import loads
+from log_config import setup_logging
+from metrics import (DELIVERY_DEPTH, ERRORS, POLL_LAG, STAGE_SECONDS,
+                     UNCHANGED_RESPONSES, UPSTREAM_RESPONSES,
+                     start_http_server)
+from models import Homework
+from outbox import Outbox
+from polling import AdaptiveInterval
+from profiling import Profiler
+from scheduler import fixed_rate
+from sender import TelegramSender
+from settings import (CHECKPOINT_FILE, COMMANDS_ENABLED, CONNECT_TIMEOUT,
+                      ENDPOINT, HOMEWORK_STATUSES, METRICS_PORT, OUTBOX_FILE,
+                      READ_TIMEOUT, RETRY_TIME, SHUTDOWN_TIMEOUT,
+                      SNAPSHOT_FILE, STATUS_INDEX_FILE, TIMELINE_FILE,
+                      WARMUP_LEAD, CustomDict, CustomList)
+from single_flight import SingleFlight
+from state_cache import StateCache
+from status_index import StatusIndex
+from timeline import Timeline
 
 load_dotenv()
 
@@ -19,85 +52,287 @@ PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
-HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
-CACHE = {}
+CLOCK = SystemClock()
+CACHE = ErrorCache(clock=lambda: CLOCK.monotonic())
+CLIENT: Optional[PracticumClient] = None
+SENDER = TelegramSender(breaker=CircuitBreaker('telegram'))
+DELIVERY: Optional[DeliveryQueue] = None
+OUTBOX: Optional[Outbox] = None
+FLIGHTS = SingleFlight()
+STATE = StateCache()
+PROFILER = Profiler()
+PROFILER.track('CACHE', lambda: len(CACHE))
+STOP = threading.Event()
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-FORMAT = '%(asctime)s :: %(name)s:%(lineno)s :: %(levelname)s :: %(message)s'
-handler = RotatingFileHandler(filename='my_logger.log',
-                              maxBytes=5000000,
-                              backupCount=5,
-                              encoding='utf-8'
-                              )
-handler.setFormatter(logging.Formatter(FORMAT))
-handler.setLevel(logging.DEBUG)
-stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(logging.Formatter(FORMAT))
-stream_handler.setLevel(logging.INFO)
-logger.addHandler(handler)
-logger.addHandler(stream_handler)
-logger.debug('Приложение бот-ассистент стартовало')
+
+
+@STAGE_SECONDS.time(stage='send_message')
+def deliver_messages(bot: Bot, chat_id: Union[int, str],
+                     messages: List[str]) -> Bot.send_message:
+    """
+    Отправляет сообщения в указанный Telegram чат.
+    Склеивает их и соблюдает ограничения частоты Telegram.
+    Если запущена очередь отправки — записывает их в журнал
+    исходящих и только ставит в очередь.
+    """
+    if DELIVERY is not None:
+        ids = OUTBOX.add(chat_id, messages) if OUTBOX is not None else None
+        DELIVERY.put(bot, chat_id, messages, ids)
+        return None
+    send_mess = SENDER.send(bot, chat_id, messages)
+    logger.info('Информация о текущем состоянии отправлено боту.')
+    return send_mess
+
+
+def deliver_message(bot: Bot, chat_id: Union[int, str],
+                    message: str) -> Bot.send_message:
+    """Отправляет сообщение в указанный Telegram чат."""
+    return deliver_messages(bot, chat_id, [message])
+
+
+def parse_chat_ids(value: Union[int, str, None]) -> List[str]:
+    """Разбирает список чатов через запятую: "123, -456" -> ["123", "-456"]."""
+    if value is None:
+        return []
+    return [chat.strip() for chat in str(value).split(',') if chat.strip()]
 
 
 def send_message(bot: Bot, message: str) -> Bot.send_message:
-    """Отправляет сообщение в Telegram чат."""
-    try:
-        send_mess = bot.send_message(TELEGRAM_CHAT_ID, message)
-        logger.info('Информация о текущем состоянии отправлено боту.')
-    except telegram.TelegramError:
-        raise BotException('Ошибка отправки сообщения в Telegram!')
+    """Отправляет сообщение во все Telegram чаты из TELEGRAM_CHAT_ID."""
+    send_mess = None
+    for chat_id in parse_chat_ids(TELEGRAM_CHAT_ID):
+        send_mess = deliver_message(bot, chat_id, message)
     return send_mess
 
 
-def get_api_answer(current_timestamp: int) -> CustomDict:
+def start_delivery(bot: Bot,
+                   outbox_path: str = OUTBOX_FILE) -> DeliveryQueue:
     """
-    Делает запрос к единственному эндпоинту API-сервиса.
-    Возвращает ответ API.
+    Открывает журнал исходящих и запускает очередь отправки.
+    Ставит в неё всё, что не было доставлено до перезапуска.
+    """
+    global DELIVERY, OUTBOX
+    OUTBOX = Outbox(outbox_path)
+    OUTBOX.purge()
+    SENDER.breaker.probe = bot.get_me
+    DELIVERY = DeliveryQueue(SENDER.send, on_delivered=OUTBOX.ack,
+                             on_failed=OUTBOX.fail).start()
+    DELIVERY_DEPTH.set_function(lambda: DELIVERY.stats()['depth'])
+    replayed = 0
+    for chat_id, ids, messages in OUTBOX.pending():
+        DELIVERY.put(bot, chat_id, messages, ids)
+        replayed += len(ids)
+    if replayed:
+        logger.info(f'Повторно поставлено в очередь сообщений: {replayed}')
+    return DELIVERY
+
+
+def start_profiling() -> None:
+    """
+    Включает профилирование, если задана переменная PROFILE.
+    Сигнал SIGUSR1 переключает его в начале следующего опроса.
+    """
+    PROFILER.install_signal()
+    if os.getenv('PROFILE'):
+        PROFILER.enable()
+
+
+def get_headers(token: str) -> Dict[str, str]:
+    """Возвращает заголовки авторизации для токена Практикума."""
+    return {'Authorization': f'OAuth {token}'}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбирает заголовок Retry-After: секунды или HTTP-дата.
+    Возвращает паузу в секундах или None.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - CLOCK.time(), 0.0)
+
+
+def probe_api() -> bool:
+    """Лёгкая проверка доступности API: HEAD-запрос к эндпоинту."""
+    http = CLIENT.session if CLIENT is not None else requests
+    response = http.head(ENDPOINT, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+    return response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+PRACTICUM_BREAKER = CircuitBreaker('practicum', probe=probe_api)
+
+
+def is_upstream_failure(status_code: int) -> bool:
+    """Код ответа говорит о сбое или перегрузке API."""
+    return (status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or status_code == HTTPStatus.TOO_MANY_REQUESTS)
+
+
+def api_error(status_code: int) -> Type[ApiResponseError]:
+    """Класс ошибки по коду ответа API: от него зависит политика повтора."""
+    if status_code in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+        return AuthError
+    if status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        return UpstreamServerError
+    return ApiResponseError
+
+
+def request_api(token: str, timestamp: int) -> requests.Response:
+    """
+    Запрашивает API через выключатель Практикума.
+    Сбой сети и ответы 5xx и 429 выключатель учитывает как сбои.
     """
-    timestamp = current_timestamp or int(time.time())
-    params = {'from_date': timestamp}
+    http = CLIENT or requests
+    PRACTICUM_BREAKER.before_call()
     try:
-        response = requests.get(
+        response = http.get(
             ENDPOINT,
-            headers=HEADERS,
-            params=params,
+            headers=get_headers(token),
+            params={'from_date': timestamp},
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
         )
     except requests.exceptions.RequestException as err:
+        PRACTICUM_BREAKER.record_failure()
         message_err = f'Не удалось подключиться. Возникла ошибка: {err}'
-        raise BotException(message_err)
+        raise TransientNetworkError(message_err)
+
+    if is_upstream_failure(response.status_code):
+        PRACTICUM_BREAKER.record_failure()
+    else:
+        PRACTICUM_BREAKER.record_success()
+    UPSTREAM_RESPONSES.inc(code=str(response.status_code))
+    return response
+
+
+def unchanged_answer(response: requests.Response,
+                     timestamp: int) -> Optional[CustomDict]:
+    """
+    Возвращает пустой ответ, если данные не изменились с прошлого опроса.
+    Это 304 на условный запрос или то же тело без учёта current_date.
+    """
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        UNCHANGED_RESPONSES.inc(reason='not_modified')
+        return {'homeworks': [], 'current_date': timestamp}
+    if CLIENT is None or response.status_code != HTTPStatus.OK:
+        return None
+    unchanged, current_date = CLIENT.unchanged(response)
+    if not unchanged:
+        return None
+    UNCHANGED_RESPONSES.inc(reason='fingerprint')
+    return {'homeworks': [], 'current_date': current_date or timestamp}
 
+
+@STAGE_SECONDS.time(stage='get_api_answer')
+def fetch_api_answer(token: str, current_timestamp: int) -> CustomDict:
+    """
+    Делает запрос к эндпоинту API-сервиса от имени токена.
+    Возвращает ответ API; если он не изменился с прошлого
+    опроса — пустой список работ без разбора тела.
+    """
+    timestamp = current_timestamp or int(CLOCK.time())
+    response = request_api(token, timestamp)
+    answer = unchanged_answer(response, timestamp)
+    if answer is not None:
+        return answer
     if response.status_code != HTTPStatus.OK:
         message_err = f'''Эндпоинт {response.url} недоступен.
         Код ответа API: {response.status_code}
         '''
-        raise BotException(message_err)
+        raise api_error(response.status_code)(
+            message_err,
+            status_code=response.status_code,
+            retry_after=parse_retry_after(
+                response.headers.get('Retry-After')
+            ),
+        )
+
+    if CLIENT is None:
+        return response.json()
+    try:
+        data = loads(response.content)
+    except ValueError as err:
+        raise MalformedPayloadError(f'Ответ API не является JSON: {err}')
+    if not isinstance(data, dict):
+        return data
+    return {key: data[key] for key in ('homeworks', 'current_date')
+            if key in data}
+
+
+def fetch_coalesced(token: str, current_timestamp: int) -> CustomDict:
+    """
+    Запрашивает API с токеном `token` от курсора `current_timestamp`.
+    Одновременные запросы с тем же токеном и курсором объединяются
+    в один: все получают ответ первого.
+    """
+    return FLIGHTS.do((token, current_timestamp), fetch_api_answer,
+                      token, current_timestamp)
+
 
-    return response.json()
+def commit_answer(token: str) -> None:
+    """
+    Отмечает последний ответ API для токена обработанным.
+    До этого его ETag и отпечаток не сокращают следующие опросы.
+    """
+    if CLIENT is not None:
+        CLIENT.commit(get_headers(token))
+
+
+def get_api_answer(current_timestamp: int) -> CustomDict:
+    """
+    Делает запрос к единственному эндпоинту API-сервиса.
+    Возвращает ответ API.
+    """
+    return fetch_coalesced(PRACTICUM_TOKEN, current_timestamp)
 
 
-def check_response(response: CustomDict) -> CustomList:
+@STAGE_SECONDS.time(stage='check_response')
+def check_response(response: CustomDict) -> List[Homework]:
     """
     Проверяет ответ API на корректность.
-    Возвращает список домашних работ.
+    Возвращает список домашних работ в виде компактных записей.
     """
     if 'homeworks' not in response:
         message_err = 'Из ответа API нет ключа "homework"!'
-        raise TypeError(message_err)
+        raise MalformedPayloadError(message_err)
 
     list_hw = response['homeworks']
 
     if not isinstance(list_hw, list):
         message_err = 'В homeworks пришел не список!'
-        raise BotException(message_err)
+        raise MalformedPayloadError(message_err)
     if not list_hw:
-        message_err = 'В homeworks пустой список!'
-        raise BotException(message_err)
+        logger.debug('Новых статусов домашних работ нет.')
+
+    try:
+        return [Homework.from_dict(homework) for homework in list_hw]
+    except AttributeError:
+        message_err = 'В homeworks пришли не словари!'
+        raise MalformedPayloadError(message_err)
+
 
-    return list_hw
+def get_current_date(response: CustomDict, default: int) -> int:
+    """
+    Возвращает курсор для следующего запроса из ответа API.
+    Если current_date отсутствует или некорректен — прежний курсор.
+    """
+    current_date = response.get('current_date')
+    if isinstance(current_date, int) and not isinstance(current_date, bool):
+        return current_date
+    logger.warning('В ответе API нет корректного current_date.')
+    return default
 
 
-def parse_status(homework: CustomList) -> str:
+@STAGE_SECONDS.time(stage='parse_status')
+def parse_status(homework: Union[Homework, CustomList]) -> str:
     """
     Извлекает из информации о конкретной домашней работе.
     Возвращает подготовленную для отправки в Telegram строку.
@@ -130,42 +365,234 @@ def cache_err(message_err: str) -> str:
     Проверяет наличие значений в КЭШ.
     Если есть то не отправляет повторно данные.
     """
-    global CACHE
-    if message_err not in CACHE:
-        CACHE[message_err] = message_err
+    if CACHE.add(message_err):
         return message_err
 
 
-def main() -> None:
-    """Основная логика работы бота."""
+def request_stop(*args) -> None:
+    """Просит основной цикл завершиться; обработчик SIGTERM и SIGINT."""
+    logger.info('Получен сигнал остановки, завершаем текущий опрос')
+    STOP.set()
+
+
+def reload_settings(interval: Optional[AdaptiveInterval] = None) -> None:
+    """
+    Перечитывает settings.py без перезапуска.
+    Обновляет период опроса RETRY_TIME и вердикты HOMEWORK_STATUSES.
+    """
+    global RETRY_TIME
+    try:
+        fresh = importlib.reload(settings)
+    except Exception as error:
+        logger.error(f'Не удалось перечитать настройки: {error}')
+        return
+    RETRY_TIME = fresh.RETRY_TIME
+    HOMEWORK_STATUSES.clear()
+    HOMEWORK_STATUSES.update(fresh.HOMEWORK_STATUSES)
+    if interval is not None:
+        interval.base = RETRY_TIME
+    logger.info(f'Настройки перечитаны, период опроса {RETRY_TIME} с')
+
+
+def install_signals(interval: AdaptiveInterval) -> None:
+    """SIGTERM и SIGINT — плавная остановка, SIGHUP — перечитать настройки."""
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGHUP, lambda *args: reload_settings(interval))
+
+
+def stop_delivery(timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    """Дожидается отправки очереди и закрывает журнал исходящих."""
+    if DELIVERY is not None:
+        DELIVERY.stop(timeout)
+    if OUTBOX is not None:
+        OUTBOX.close()
+
+
+def restore_state(cursor_key: str,
+                  interval: AdaptiveInterval) -> Dict[str, object]:
+    """
+    Восстанавливает снимок прошлого процесса.
+    Кэш ошибок — всегда, а курсор, интервал, время опроса
+    и статусы для команд — только для того же токена.
+    """
+    snapshot = load_snapshot(SNAPSHOT_FILE)
+    CACHE.restore(snapshot.get('errors', {}), snapshot.get('age', 0.0))
+    if snapshot.get('token') != cursor_key:
+        return {}
+    STATE.restore(snapshot.get('state', {}))
+    interval.current = snapshot.get('interval', interval.current)
+    interval.reviewing.update(snapshot.get('reviewing', ()))
+    return snapshot
+
+
+def save_state(cursor_key: str, cursor: int, interval: AdaptiveInterval,
+               next_poll: float) -> None:
+    """Сохраняет снимок состояния для тёплого перезапуска."""
+    save_snapshot(SNAPSHOT_FILE, {
+        'token': cursor_key,
+        'cursor': cursor,
+        'next_poll': next_poll,
+        'interval': interval.current,
+        'reviewing': list(interval.reviewing),
+        'errors': CACHE.snapshot(),
+        'state': STATE.snapshot(),
+    })
+
+
+@dataclass
+class Poller:
+    """Состояние основного цикла между опросами."""
+
+    bot: Bot
+    checkpoint: Checkpoint
+    statuses: StatusIndex
+    timeline: Timeline
+    interval: AdaptiveInterval
+    cursor_key: str
+    current_timestamp: int
+    chat_ids: List[str]
+    updater: Optional[Updater] = None
+    planned: float = 0.0
+    snapshot: Dict[str, object] = field(default_factory=dict)
+
+
+def start_bot() -> Poller:
+    """
+    Проверяет окружение и поднимает всё, что нужно циклу опроса.
+    Клиент API, очередь отправки, метрики, команды и состояние
+    прошлого запуска.
+    """
     if not check_tokens():
         logger.critical('''Отсутствует(ют) переменная(ые) окружения.
         Программа принудительно остановлена.''')
         raise BotException(
             'Проверьте переменные окружения!'
         )
-    bot = Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = int(time.time())
-    while True:
+    global CLIENT
+    bot = make_bot(TELEGRAM_TOKEN)
+    CLIENT = PracticumClient()
+    start_delivery(bot)
+    if METRICS_PORT:
+        start_http_server()
+    updater = None
+    if COMMANDS_ENABLED:
+        updater = start_commands(TELEGRAM_TOKEN, STATE)
+    checkpoint = Checkpoint(CHECKPOINT_FILE)
+    cursor_key = token_key(PRACTICUM_TOKEN)
+    interval = AdaptiveInterval()
+    snapshot = restore_state(cursor_key, interval)
+    current_timestamp = (checkpoint.get(cursor_key)
+                         or snapshot.get('cursor') or int(CLOCK.time()))
+    start_profiling()
+    install_signals(interval)
+    return Poller(
+        bot=bot,
+        checkpoint=checkpoint,
+        statuses=StatusIndex(STATUS_INDEX_FILE),
+        timeline=Timeline(TIMELINE_FILE),
+        interval=interval,
+        cursor_key=cursor_key,
+        current_timestamp=current_timestamp,
+        chat_ids=parse_chat_ids(TELEGRAM_CHAT_ID),
+        updater=updater,
+        snapshot=snapshot,
+    )
+
+
+def poll_once(poller: Poller) -> float:
+    """
+    Выполняет один опрос и сохраняет курсор.
+    Рассылает изменившиеся статусы во все чаты.
+    Возвращает паузу до следующего опроса.
+    """
+    response = get_api_answer(poller.current_timestamp)
+    list_hw = check_response(response)
+    changed = poller.statuses.changed(list_hw)
+    messages = [parse_status(homework) for homework in changed]
+    for chat_id in poller.chat_ids:
+        if messages:
+            deliver_messages(poller.bot, chat_id, messages)
+        STATE.update(chat_id, list_hw)
+    for homework in changed:
+        poller.statuses.remember(homework)
+    poller.timeline.append(PRACTICUM_TOKEN, changed)
+    poller.current_timestamp = get_current_date(
+        response, poller.current_timestamp)
+    poller.checkpoint.set(poller.cursor_key, poller.current_timestamp)
+    poller.checkpoint.flush()
+    poller.statuses.flush()
+    commit_answer(PRACTICUM_TOKEN)
+    return poller.interval.on_result(list_hw)
+
+
+def handle_error(poller: Poller, error: Exception) -> float:
+    """
+    Сообщает об ошибке опроса, если о ней ещё не сообщали.
+    Возвращает паузу по политике повтора ошибки.
+    """
+    ERRORS.inc(type=type(error).__name__)
+    policy = retry_policy(error)
+    delay = poller.interval.on_error(getattr(error, 'retry_after', None),
+                                     policy)
+    message = f'Сбой в работе программы: {error}'
+    logger.error(message)
+    if cache_err(message):
+        send_message(poller.bot, message)
+    if policy.fatal:
+        logger.critical('Опрос остановлен: повторы не помогут')
+        STOP.set()
+    return delay
+
+
+def wait_next_poll(poller: Poller, delay: float) -> None:
+    """Ждёт следующего опроса с фиксированным темпом от прошлого срока."""
+    now = CLOCK.monotonic()
+    poller.planned = fixed_rate(poller.planned, delay, now)
+    wait = poller.planned - now
+    logger.debug(f'Следующий опрос через {wait:.0f} с')
+    CLIENT.schedule_warmup(ENDPOINT, wait - WARMUP_LEAD)
+    CLOCK.sleep(wait, STOP)
+
+
+def stop_bot(poller: Poller) -> None:
+    """Останавливает фоновые службы и сохраняет снимок состояния."""
+    CLIENT.cancel_warmup()
+    if poller.updater is not None:
+        poller.updater.stop()
+    stop_delivery()
+    poller.checkpoint.flush()
+    poller.statuses.flush()
+    poller.timeline.close()
+    next_poll = CLOCK.time() + max(poller.planned - CLOCK.monotonic(), 0.0)
+    save_state(poller.cursor_key, poller.current_timestamp,
+               poller.interval, next_poll)
+    PROFILER.disable()
+    CLIENT.close()
+    logger.info('Бот остановлен, состояние сохранено')
+
+
+def main() -> None:
+    """Основная логика работы бота."""
+    setup_logging()
+    logger.debug('Приложение бот-ассистент стартовало')
+    poller = start_bot()
+    wait = max(poller.snapshot.get('next_poll', 0) - CLOCK.time(), 0.0)
+    if wait:
+        logger.info(f'Тёплый перезапуск: первый опрос через {wait:.0f} с')
+        CLOCK.sleep(wait, STOP)
+    poller.planned = CLOCK.monotonic()
+    while not STOP.is_set():
+        POLL_LAG.set(max(CLOCK.monotonic() - poller.planned, 0.0))
+        delay = RETRY_TIME
         try:
-            response = get_api_answer(current_timestamp)
-            list_hw = check_response(response)
-            for homework in list_hw:
-                message = parse_status(homework)
-                send_message(bot, message)
-            current_timestamp = int(time.time())
-        except BotException as error:
-            message = f'Сбой в работе программы: {error}'
-            logger.error(message)
-            if cache_err(message):
-                send_message(bot, message)
+            with PROFILER.iteration():
+                delay = poll_once(poller)
         except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logger.error(error)
-            if cache_err(message):
-                send_message(bot, message)
+            delay = handle_error(poller, error)
         finally:
-            time.sleep(RETRY_TIME)
+            wait_next_poll(poller, delay)
+    stop_bot(poller)
 
 
 if __name__ == '__main__':
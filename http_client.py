@@ -0,0 +1,193 @@
+"""Долгоживущий HTTP-клиент к API Практикума с пулом соединений."""
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from settings import CONNECT_TIMEOUT, HTTP_POOL_SIZE, READ_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CURRENT_DATE = re.compile(rb'"current_date"\s*:\s*(\d+)')
+
+
+class Validators(NamedTuple):
+    """Валидаторы последнего ответа для одного токена."""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: Optional[bytes]
+
+
+def body_digest(body: bytes) -> Tuple[bytes, Optional[int]]:
+    """
+    Возвращает отпечаток тела без изменчивого current_date
+    и само значение current_date.
+    """
+    match = CURRENT_DATE.search(body)
+    current_date = None
+    if match is not None:
+        current_date = int(match.group(1))
+        body = body[:match.start(1)] + body[match.end(1):]
+    return hashlib.blake2b(body, digest_size=16).digest(), current_date
+
+
+class RequestStats:
+    """Накопительная статистика запросов клиента."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+
+    def record(self, elapsed: float, response: requests.Response) -> None:
+        """Учитывает один выполненный запрос."""
+        body = len(response.content)
+        wire = int(response.headers.get('Content-Length') or body)
+        with self._lock:
+            self.requests += 1
+            self.total_time += elapsed
+            self.last_time = elapsed
+            self.wire_bytes += wire
+            self.body_bytes += body
+
+    def snapshot(self) -> Dict[str, float]:
+        """Возвращает текущие значения статистики."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'total_time': self.total_time,
+                'last_time': self.last_time,
+                'avg_time': (self.total_time / self.requests
+                             if self.requests else 0.0),
+                'wire_bytes': self.wire_bytes,
+                'body_bytes': self.body_bytes,
+            }
+
+
+class PracticumClient:
+    """
+    Сессия requests с пулом keep-alive соединений, таймаутами и gzip.
+    Переиспользует TCP/TLS-соединения между опросами.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE,
+                 connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT) -> None:
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.stats = RequestStats()
+        self._warmup: Optional[threading.Timer] = None
+        self._validators: Dict[str, Validators] = {}
+        self._pending: Dict[str, Validators] = {}
+
+    @staticmethod
+    def _key(headers: Optional[Dict[str, str]]) -> Optional[str]:
+        """Ключ валидаторов: хеш заголовка авторизации."""
+        auth = (headers or {}).get('Authorization')
+        if auth is None:
+            return None
+        return hashlib.sha256(auth.encode()).hexdigest()[:16]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Выполняет GET-запрос через пул и учитывает его время.
+        Если сервер присылал ETag или Last-Modified, запрос
+        становится условным.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        key = self._key(kwargs.get('headers'))
+        validators = self._validators.get(key)
+        if validators is not None:
+            headers = dict(kwargs['headers'])
+            if validators.etag:
+                headers['If-None-Match'] = validators.etag
+            if validators.last_modified:
+                headers['If-Modified-Since'] = validators.last_modified
+            kwargs['headers'] = headers
+        start = time.perf_counter()
+        response = self.session.get(url, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.stats.record(elapsed, response)
+        logger.debug(f'GET {url}: {response.status_code} за {elapsed:.3f} с')
+        return response
+
+    def unchanged(self, response: requests.Response) -> Tuple[bool,
+                                                              Optional[int]]:
+        """
+        Сравнивает тело ответа с последним обработанным ответом
+        того же токена, не разбирая JSON. Возвращает признак
+        совпадения и current_date. Валидаторы нового ответа
+        вступают в силу только после commit().
+        """
+        key = self._key(response.request.headers)
+        digest, current_date = body_digest(response.content)
+        previous = self._validators.get(key)
+        self._pending[key] = Validators(
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            digest,
+        )
+        return (previous is not None and previous.digest == digest,
+                current_date)
+
+    def commit(self, headers: Optional[Dict[str, str]]) -> None:
+        """
+        Подтверждает, что последний ответ для этих заголовков
+        обработан и курсор сдвинут. Если опрос упал раньше,
+        повтор с тем же курсором получит ответ целиком.
+        """
+        key = self._key(headers)
+        validators = self._pending.pop(key, None)
+        if validators is not None:
+            self._validators[key] = validators
+
+    def connections(self, url: str) -> Dict[str, int]:
+        """
+        Возвращает число открытых соединений и запросов в пуле хоста.
+        Их соотношение показывает, сколько рукопожатий сэкономлено.
+        """
+        pool = self.adapter.poolmanager.connection_from_url(url)
+        return {
+            'connections': pool.num_connections,
+            'requests': pool.num_requests,
+        }
+
+    def warm(self, url: str) -> None:
+        """Открывает соединение с хостом заранее, лёгким HEAD-запросом."""
+        try:
+            self.session.head(url, timeout=self.timeout)
+        except requests.exceptions.RequestException as err:
+            logger.debug(f'Не удалось прогреть соединение: {err}')
+
+    def schedule_warmup(self, url: str, delay: float) -> None:
+        """Прогревает соединение через `delay` секунд в фоновом потоке."""
+        self.cancel_warmup()
+        if delay <= 0:
+            return
+        self._warmup = threading.Timer(delay, self.warm, args=(url,))
+        self._warmup.daemon = True
+        self._warmup.start()
+
+    def cancel_warmup(self) -> None:
+        """Отменяет запланированный прогрев."""
+        if self._warmup is not None:
+            self._warmup.cancel()
+            self._warmup = None
+
+    def close(self) -> None:
+        """Закрывает все соединения пула."""
+        self.cancel_warmup()
+        self.session.close()
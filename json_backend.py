@@ -0,0 +1,23 @@
+"""Разбор JSON самым быстрым доступным модулем."""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Все три модуля сообщают об ошибке разбора наследником ValueError.
+if orjson is not None:
+    BACKEND = 'orjson'
+    loads = orjson.loads
+elif ujson is not None:
+    BACKEND = 'ujson'
+    loads = ujson.loads
+else:
+    BACKEND = 'json'
+    loads = json.loads
@@ -0,0 +1,131 @@
+"""Нагрузочный прогон движка опроса против локальной заглушки API."""
+import argparse
+import asyncio
+import logging
+import resource
+import threading
+import time
+from typing import Dict, List
+
+import homework
+from delivery import DeliveryQueue
+from engine import PollingEngine, Subscription
+from fake_api import FakePracticumAPI, FakePracticumServer
+from http_client import PracticumClient
+from polling import AdaptiveInterval
+from sender import TelegramSender
+
+
+class NullBot:
+    """Бот, который ничего не отправляет."""
+
+    def send_message(self, chat_id, text, **kwargs):
+        return None
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Перцентиль по отсортированному списку значений."""
+    if not values:
+        return 0.0
+    index = min(int(len(values) * fraction), len(values) - 1)
+    return values[index]
+
+
+class LatencyRecorder:
+    """Оборачивает запрос к API и запоминает его длительность."""
+
+    def __init__(self, fetch) -> None:
+        self.fetch = fetch
+        self.latencies: List[float] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, token, current_timestamp):
+        start = time.perf_counter()
+        try:
+            return self.fetch(token, current_timestamp)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies.append(elapsed)
+
+
+def run(subscriptions: int, duration: float, interval: float,
+        concurrency: int, api: FakePracticumAPI) -> Dict[str, float]:
+    """Гоняет движок `duration` секунд и возвращает сводку."""
+    server = FakePracticumServer(api).start()
+    saved = (homework.ENDPOINT, homework.CLIENT, homework.DELIVERY,
+             homework.fetch_api_answer)
+    recorder = LatencyRecorder(homework.fetch_api_answer)
+    homework.ENDPOINT = server.endpoint
+    homework.CLIENT = PracticumClient(pool_size=concurrency)
+    homework.DELIVERY = DeliveryQueue(
+        TelegramSender(global_rate=10 ** 6, chat_rate=10 ** 6).send
+    ).start()
+    homework.fetch_api_answer = recorder
+    subs = [
+        Subscription(f'token-{number}', number)
+        for number in range(subscriptions)
+    ]
+    engine = PollingEngine(NullBot(), subs, concurrency=concurrency)
+    for feed in engine.feeds:
+        feed.interval = AdaptiveInterval(interval, interval, interval)
+    start = time.perf_counter()
+    try:
+        asyncio.run(asyncio.wait_for(engine.run(), duration))
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        elapsed = time.perf_counter() - start
+        engine.close()
+        homework.DELIVERY.stop(timeout=5)
+        homework.CLIENT.close()
+        (homework.ENDPOINT, homework.CLIENT, homework.DELIVERY,
+         homework.fetch_api_answer) = saved
+        server.stop()
+    latencies = sorted(recorder.latencies)
+    return {
+        'subscriptions': subscriptions,
+        'duration': elapsed,
+        'polls': len(latencies),
+        'polls_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'errors': recorder.errors,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_rss_mb': resource.getrusage(
+            resource.RUSAGE_SELF
+        ).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    """Запускает нагрузочный прогон из командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--subscriptions', type=int, default=100)
+    parser.add_argument('-d', '--duration', type=float, default=10.0,
+                        help='длительность прогона, с')
+    parser.add_argument('-i', '--interval', type=float, default=1.0,
+                        help='интервал опроса подписки, с')
+    parser.add_argument('-c', '--concurrency', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--homeworks', type=int, default=1)
+    args = parser.parse_args()
+    # Ошибки заглушки ожидаемы и учитываются в отчёте.
+    logging.disable(logging.ERROR)
+    api = FakePracticumAPI(args.latency, args.jitter, args.error_rate,
+                           args.homeworks)
+    report = run(args.subscriptions, args.duration, args.interval,
+                 args.concurrency, api)
+    for key, value in report.items():
+        print(f'{key:>18}: {value:.2f}' if isinstance(value, float)
+              else f'{key:>18}: {value}')
+
+
+if __name__ == '__main__':
+    main()
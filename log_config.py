@@ -0,0 +1,78 @@
+"""Настройка логирования бота через очередь и фоновый поток записи."""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+from settings import LOG_BACKUP_COUNT, LOG_FILE, LOG_MAX_BYTES
+
+FORMAT = '%(asctime)s :: %(name)s:%(lineno)s :: %(levelname)s :: %(message)s'
+NOISY_LOGGERS = ('urllib3', 'telegram', 'apscheduler')
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(filename: str = LOG_FILE) -> QueueListener:
+    """
+    Настраивает корневой логгер: записи уходят в очередь,
+    а в файл и консоль их пишет фоновый поток.
+    Повторный вызов возвращает уже запущенный слушатель.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(FORMAT)
+    file_handler = RotatingFileHandler(filename=filename,
+                                       maxBytes=LOG_MAX_BYTES,
+                                       backupCount=LOG_BACKUP_COUNT,
+                                       encoding='utf-8'
+                                       )
+    file_handler.setFormatter(formatter)
+    file_handler.setLevel(logging.DEBUG)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    stream_handler.setLevel(logging.INFO)
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, file_handler, stream_handler,
+                              respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    root.addHandler(QueueHandler(log_queue))
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def _remove_queue_handlers() -> None:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+
+
+def stop_logging() -> None:
+    """Дописывает оставшиеся в очереди записи и останавливает поток."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _remove_queue_handlers()
+    _listener = None
+
+
+def reset_logging() -> None:
+    """
+    Забывает настройку, унаследованную от родителя при fork.
+    Поток слушателя в дочернем процессе не работает, и без сброса
+    записи копились бы в очереди, которую никто не читает.
+    """
+    global _listener
+    _remove_queue_handlers()
+    _listener = None
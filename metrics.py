@@ -0,0 +1,288 @@
+"""Метрики бота и HTTP-эндпоинт в формате Prometheus."""
+import bisect
+import functools
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from settings import METRICS_HOST, METRICS_PORT
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def escape(value: str) -> str:
+    """Экранирует значение метки."""
+    return (str(value).replace('\\', '\\\\')
+            .replace('\n', '\\n').replace('"', '\\"'))
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Формирует блок меток {name="value",...}."""
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value: float) -> str:
+    """Форматирует число для экспозиции."""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Базовая метрика с метками."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], float]] = None
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f'Метрика {self.name} ожидает метки {self.labelnames}'
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Берёт значение метрики без меток из функции при выгрузке."""
+        self._function = function
+
+    def samples(self) -> List[str]:
+        """Строки экспозиции со значениями метрики."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Строки экспозиции вместе с HELP и TYPE."""
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    """Монотонно растущий счётчик."""
+
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Увеличивает счётчик."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Текущее значение счётчика."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            return [f'{self.name} {format_value(self._function())}']
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f'{self.name}{format_labels(self.labelnames, key)} '
+            f'{format_value(value)}'
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Значение, которое может расти и уменьшаться."""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels: str) -> None:
+        """Устанавливает значение."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Гистограмма распределения значений по корзинам."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Учитывает одно наблюдение."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Счётчики по корзинам, затем сумма и количество.
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def time(self, **labels: str) -> Callable:
+        """Декоратор, замеряющий длительность вызова функции."""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+            return wrapper
+        return decorator
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(series)) for key, series in self._series.items()
+            )
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = format_labels(
+                    self.labelnames + ('le',), key + (format_value(bound),)
+                )
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {format_value(series[-2])}')
+            lines.append(f'{self.name}_count{labels} {int(series[-1])}')
+        return lines
+
+
+class Registry:
+    """Набор метрик, выгружаемых вместе."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Добавляет метрику в реестр."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        """Создаёт и регистрирует счётчик."""
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        """Создаёт и регистрирует gauge."""
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        """Создаёт и регистрирует гистограмму."""
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        """Текст всех метрик в формате экспозиции Prometheus."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'homework_stage_seconds', 'Длительность этапов опроса и отправки.',
+    ['stage'],
+)
+ERRORS = REGISTRY.counter(
+    'homework_errors_total', 'Ошибки по типам.', ['type'],
+)
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    'homework_upstream_responses_total',
+    'Ответы API Практикума по кодам статуса.', ['code'],
+)
+UNCHANGED_RESPONSES = REGISTRY.counter(
+    'homework_unchanged_responses_total',
+    'Ответы без изменений, пропущенные без разбора.', ['reason'],
+)
+MESSAGES_SENT = REGISTRY.counter(
+    'homework_messages_sent_total', 'Сообщения, принятые Telegram.',
+)
+CACHE_HITS = REGISTRY.counter(
+    'homework_error_cache_hits_total', 'Повторы ошибок, подавленные кэшем.',
+)
+CACHE_MISSES = REGISTRY.counter(
+    'homework_error_cache_misses_total', 'Новые ошибки, прошедшие кэш.',
+)
+DELIVERY_DEPTH = REGISTRY.gauge(
+    'homework_delivery_queue_depth', 'Чаты, ожидающие отправки.',
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    'homework_circuit_state',
+    'Состояние выключателя: 0 — замкнут, 1 — проба, 2 — разомкнут.',
+    ['name'],
+)
+POLL_LAG = REGISTRY.gauge(
+    'homework_poll_lag_seconds',
+    'Насколько последний опрос отстал от расписания.',
+)
+COALESCED_FETCHES = REGISTRY.counter(
+    'homework_coalesced_fetches_total',
+    'Запросы к API, объединённые с уже выполняющимся.',
+)
+TELEGRAM_REQUEST_SECONDS = REGISTRY.histogram(
+    'homework_telegram_request_seconds',
+    'Длительность запросов к Bot API по методам.', ['method'],
+)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдаёт метрики реестра по GET /metrics."""
+
+    registry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format % args)
+
+
+def start_http_server(port: int = METRICS_PORT, host: str = METRICS_HOST,
+                      registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Запускает HTTP-эндпоинт метрик в фоновом потоке."""
+    handler = type('Handler', (MetricsHandler,), {'registry': registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever,
+                              name='metrics', daemon=True)
+    thread.start()
+    logger.info(f'Метрики доступны на http://{host}:{port}/metrics')
+    return server
@@ -0,0 +1,68 @@
+"""Компактные записи о домашних работах."""
+import sys
+from typing import Any, Dict, Optional, Union
+
+from settings import HOMEWORK_STATUSES
+
+STATUSES = {status: sys.intern(status) for status in HOMEWORK_STATUSES}
+
+
+def intern_status(status: Any) -> Any:
+    """Возвращает общий объект строки для известного статуса."""
+    if isinstance(status, str):
+        return STATUSES.get(status) or sys.intern(status)
+    return status
+
+
+class Homework:
+    """
+    Домашняя работа из ответа API: только нужные боту поля в __slots__.
+    Поддерживает чтение как словарь ответа API: `hw['status']`,
+    `hw.get('id')`, `'homework_name' in hw`.
+    """
+
+    __slots__ = ('id', 'homework_name', 'status', 'date_updated')
+
+    def __init__(self, id: Optional[int] = None,
+                 homework_name: Optional[str] = None,
+                 status: Optional[str] = None,
+                 date_updated: Optional[str] = None) -> None:
+        self.id = id
+        self.homework_name = homework_name
+        self.status = intern_status(status)
+        self.date_updated = date_updated
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Union[str, int]]) -> 'Homework':
+        """Создаёт запись из словаря ответа API."""
+        return cls(data.get('id'), data.get('homework_name'),
+                   data.get('status'), data.get('date_updated'))
+
+    def to_dict(self) -> Dict[str, Union[str, int]]:
+        """Словарь с заполненными полями записи."""
+        return {
+            key: getattr(self, key) for key in self.__slots__
+            if getattr(self, key) is not None
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Homework):
+            return all(getattr(self, key) == getattr(other, key)
+                       for key in self.__slots__)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'Homework({self.to_dict()!r})'
@@ -0,0 +1,166 @@
+"""Журнал исходящих сообщений в SQLite для доставки at-least-once."""
+import logging
+import sqlite3
+import threading
+import time
+from itertools import groupby
+from typing import Iterator, List, Optional, Tuple
+
+from settings import (OUTBOX_BATCH_SIZE, OUTBOX_FILE, OUTBOX_FLUSH_INTERVAL,
+                      OUTBOX_RETENTION)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created REAL NOT NULL,
+    delivered REAL,
+    failed REAL
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS outbox_unsent
+    ON outbox (id) WHERE delivered IS NULL AND failed IS NULL;
+DROP INDEX IF EXISTS outbox_pending;
+"""
+
+
+class Outbox:
+    """
+    Каждое сообщение сначала записывается в SQLite (режим WAL),
+    а после ответа Telegram помечается доставленным; сообщения,
+    которые доставить нельзя, помечаются `fail` и больше не повторяются.
+    Сообщения одного вызова `add` пишутся одной транзакцией,
+    подтверждения копятся и фиксируются пачками — при наборе
+    `batch_size` или по таймеру через `flush_interval`: потерянное
+    подтверждение приводит лишь к повторной отправке.
+    """
+
+    def __init__(self, path: str = OUTBOX_FILE,
+                 batch_size: int = OUTBOX_BATCH_SIZE,
+                 flush_interval: float = OUTBOX_FLUSH_INTERVAL,
+                 retention: float = OUTBOX_RETENTION) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._acks: List[int] = []
+        self._flushed = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in
+                   self._conn.execute('PRAGMA table_info(outbox)')}
+        if 'failed' not in columns:
+            self._conn.execute('ALTER TABLE outbox ADD COLUMN failed REAL')
+        self._conn.executescript(INDEXES)
+
+    def add(self, chat_id, messages: List[str]) -> List[int]:
+        """Записывает сообщения чату и возвращает их идентификаторы."""
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute('BEGIN')
+                return [
+                    self._conn.execute(
+                        'INSERT INTO outbox (chat_id, text, created) '
+                        'VALUES (?, ?, ?)', (str(chat_id), text, now),
+                    ).lastrowid
+                    for text in messages
+                ]
+
+    def ack(self, ids: List[int]) -> None:
+        """Отмечает сообщения доставленными (с отложенной фиксацией)."""
+        with self._lock:
+            self._acks.extend(ids)
+            due = (len(self._acks) >= self.batch_size
+                   or time.monotonic() - self._flushed >= self.flush_interval)
+            if due:
+                self._flush_acks()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def fail(self, ids: List[int]) -> None:
+        """Отмечает сообщения, которые доставлять больше не нужно."""
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute('BEGIN')
+                self._conn.executemany(
+                    'UPDATE outbox SET failed = ? WHERE id = ?',
+                    [(now, number) for number in ids],
+                )
+
+    def _flush_acks(self) -> None:
+        self._flushed = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._acks:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.execute('BEGIN')
+            self._conn.executemany(
+                'UPDATE outbox SET delivered = ? WHERE id = ?',
+                [(now, number) for number in self._acks],
+            )
+        self._acks.clear()
+
+    def flush(self) -> None:
+        """Фиксирует накопленные подтверждения."""
+        with self._lock:
+            self._flush_acks()
+
+    def pending(self) -> Iterator[Tuple[str, List[int], List[str]]]:
+        """
+        Недоставленные сообщения в порядке записи, сгруппированные
+        по подряд идущим чатам. Читаются страницами по частичному
+        индексу, без загрузки всего журнала в память.
+        """
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    'SELECT id, chat_id, text FROM outbox '
+                    'WHERE delivered IS NULL AND failed IS NULL AND id > ? '
+                    'ORDER BY id LIMIT ?',
+                    (last_id, self.batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for chat_id, group in groupby(rows, key=lambda row: row[1]):
+                group = list(group)
+                yield (chat_id, [row[0] for row in group],
+                       [row[2] for row in group])
+
+    def purge(self) -> int:
+        """
+        Удаляет доставленные и недоставляемые сообщения
+        старше срока хранения.
+        """
+        before = time.time() - self.retention
+        with self._lock:
+            with self._conn:
+                self._conn.execute('BEGIN')
+                cursor = self._conn.execute(
+                    'DELETE FROM outbox WHERE delivered < ? OR failed < ?',
+                    (before, before),
+                )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Фиксирует подтверждения и закрывает базу."""
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,77 @@
+"""Адаптивный интервал опроса API в зависимости от статусов работ."""
+import random
+from typing import Callable, Iterable, Optional, Set
+
+from exeptions import RetryPolicy
+from settings import (POLL_BACKOFF_FACTOR, POLL_JITTER, POLL_MAX_INTERVAL,
+                      POLL_MIN_INTERVAL, RETRY_TIME, CustomList)
+
+REVIEWING = 'reviewing'
+
+
+class AdaptiveInterval:
+    """
+    Подбирает паузу до следующего опроса.
+    Пока хоть одна работа на проверке — опрашиваем часто,
+    пока ничего не меняется — экспоненциально отступаем.
+    """
+
+    def __init__(self, base: float = RETRY_TIME,
+                 minimum: float = POLL_MIN_INTERVAL,
+                 maximum: float = POLL_MAX_INTERVAL,
+                 factor: float = POLL_BACKOFF_FACTOR,
+                 jitter: float = POLL_JITTER,
+                 rand: Callable[[], float] = random.random) -> None:
+        self.base = base
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.rand = rand
+        self.current = base
+        self.failures = 0
+        self.reviewing: Set[str] = set()
+
+    def _jittered(self, delay: float) -> float:
+        spread = delay * self.jitter
+        return max(0.0, delay + (2 * self.rand() - 1) * spread)
+
+    def _backoff(self) -> float:
+        self.current = min(self.current * self.factor, self.maximum)
+        return self.current
+
+    def on_result(self, homeworks: CustomList) -> float:
+        """Пауза после успешного опроса с полученными работами."""
+        self.failures = 0
+        for homework in homeworks:
+            name = homework.get('homework_name')
+            if homework.get('status') == REVIEWING:
+                self.reviewing.add(name)
+            else:
+                self.reviewing.discard(name)
+        if self.reviewing:
+            self.current = self.minimum
+        elif homeworks:
+            self.current = self.base
+        else:
+            self._backoff()
+        return self._jittered(self.current)
+
+    def on_error(self, retry_after: Optional[float] = None,
+                 policy: Optional[RetryPolicy] = None) -> float:
+        """
+        Пауза после ошибки; положительный Retry-After от сервера
+        в приоритете и только удлиняется на долю `jitter`, чтобы
+        подписки не повторяли одновременно.
+        Для временных ошибок первые `policy.attempts` повторов идут
+        быстро, с нарастающей паузой, затем — обычный интервал.
+        """
+        self.failures += 1
+        if retry_after is not None and retry_after > 0:
+            return float(retry_after) * (1 + self.rand() * self.jitter)
+        if policy is not None and self.failures <= policy.attempts:
+            return self._jittered(min(
+                policy.initial * policy.factor ** (self.failures - 1),
+                policy.maximum,
+            ))
+        return self._jittered(self._backoff())
@@ -0,0 +1,158 @@
+"""Профилирование работающего бота по запросу."""
+import cProfile
+import io
+import logging
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from settings import (PROFILE_DUMP_INTERVAL, PROFILE_FILE,
+                      PROFILE_SAMPLE_EVERY, PROFILE_TOP)
+
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """
+    Выборочно профилирует итерации цикла через cProfile
+    и следит за ростом памяти через tracemalloc. Раз в
+    `dump_interval` секунд дописывает в файл самые горячие функции,
+    места с наибольшим приростом выделений и размеры структур.
+    Включается `enable()`, переменной окружения или сигналом;
+    сигнал только ставит флаг, переключение делает цикл.
+    """
+
+    def __init__(self, path: str = PROFILE_FILE,
+                 sample_every: int = PROFILE_SAMPLE_EVERY,
+                 dump_interval: float = PROFILE_DUMP_INTERVAL,
+                 top: int = PROFILE_TOP) -> None:
+        self.path = path
+        self.sample_every = sample_every
+        self.dump_interval = dump_interval
+        self.top = top
+        self.enabled = False
+        self.iterations = 0
+        self._sizes: Dict[str, Callable[[], int]] = {}
+        self._stats: Optional[pstats.Stats] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._dumped = time.monotonic()
+        self._active = False
+        self._owns_tracing = False
+        self._toggle_requested = False
+        self._lock = threading.Lock()
+
+    def track(self, name: str, size: Callable[[], int]) -> None:
+        """Добавляет в отчёт размер структуры, например CACHE."""
+        self._sizes[name] = size
+
+    def enable(self) -> None:
+        """Включает профилирование."""
+        if self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._baseline = tracemalloc.take_snapshot()
+        self._stats = None
+        self._dumped = time.monotonic()
+        self.enabled = True
+        logger.info(f'Профилирование включено, отчёты в {self.path}')
+
+    def disable(self) -> None:
+        """Записывает итоговый отчёт и выключает профилирование."""
+        if not self.enabled:
+            return
+        self.dump()
+        self.enabled = False
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        self._baseline = None
+        logger.info('Профилирование выключено')
+
+    def toggle(self, *args) -> None:
+        """Переключает профилирование."""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def request_toggle(self, *args) -> None:
+        """
+        Обработчик сигнала: только просит переключить профилирование.
+        Переключение с записью отчёта берёт `self._lock`; из обработчика,
+        прервавшего поток с этим замком, оно бы зависло навсегда.
+        """
+        self._toggle_requested = True
+
+    def install_signal(self, signum: int = signal.SIGUSR1) -> None:
+        """
+        Переключать профилирование по сигналу (по умолчанию SIGUSR1)
+        в начале следующей итерации цикла.
+        """
+        signal.signal(signum, self.request_toggle)
+
+    @contextmanager
+    def iteration(self) -> Iterator[None]:
+        """Оборачивает одну итерацию цикла."""
+        if self._toggle_requested:
+            self._toggle_requested = False
+            self.toggle()
+        if not self.enabled:
+            yield
+            return
+        with self._lock:
+            self.iterations += 1
+            sample = (self.iterations % self.sample_every == 0
+                      and not self._active)
+            if sample:
+                self._active = True
+        if not sample:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._active = False
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+            if time.monotonic() - self._dumped >= self.dump_interval:
+                self.dump()
+
+    def report(self) -> str:
+        """Текст отчёта: горячие функции, рост памяти, размеры."""
+        out = io.StringIO()
+        out.write(f'=== {time.strftime("%Y-%m-%d %H:%M:%S")} '
+                  f'итераций: {self.iterations}\n')
+        for name, size in self._sizes.items():
+            out.write(f'{name}: {size()}\n')
+        with self._lock:
+            if self._stats is not None:
+                self._stats.stream = out
+                self._stats.sort_stats('cumulative').print_stats(self.top)
+        if self._baseline is not None and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            out.write('Наибольший рост выделений памяти:\n')
+            for stat in snapshot.compare_to(self._baseline,
+                                            'lineno')[:self.top]:
+                out.write(f'{stat}\n')
+        return out.getvalue()
+
+    def dump(self) -> None:
+        """Дописывает отчёт в файл."""
+        self._dumped = time.monotonic()
+        try:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(self.report())
+        except OSError as error:
+            logger.error(f'Не удалось записать профиль: {error}')
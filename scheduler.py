@@ -0,0 +1,91 @@
+"""Расписание опросов с фиксированным темпом на монотонных часах."""
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+def fixed_rate(due: float, delay: float, now: float) -> float:
+    """
+    Следующий срок с фиксированным темпом: от прошлого срока,
+    а не от конца работы, поэтому время работы не копится
+    в сдвиг расписания. Пропущенный срок не догоняется пачкой —
+    опрос просто идёт сразу.
+    """
+    return max(due + delay, now)
+
+
+class Scheduler:
+    """
+    Сроки опросов в двоичной куче: ближайший срок за O(1),
+    добавление и извлечение за O(log n) при любом числе подписок.
+    Запись удаляется лениво: при повторном добавлении ключа
+    старая запись в куче просто пропускается.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._due: Dict[Hashable, float] = {}
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._due
+
+    def add(self, key: Hashable, due: float) -> None:
+        """Назначает ключу срок по часам планировщика."""
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, next(self._order), key))
+
+    def spread(self, keys: Sequence[Hashable], interval: float) -> None:
+        """
+        Равномерно раскладывает первые сроки по интервалу,
+        чтобы подписки не срабатывали одной пачкой.
+        """
+        now = self.clock()
+        step = interval / len(keys) if keys else 0.0
+        for number, key in enumerate(keys):
+            self.add(key, now + number * step)
+
+    def reschedule(self, key: Hashable, due: float, delay: float) -> float:
+        """Назначает следующий срок с фиксированным темпом от `due`."""
+        following = fixed_rate(due, delay, self.clock())
+        self.add(key, following)
+        return following
+
+    def remove(self, key: Hashable) -> None:
+        """Убирает ключ из расписания."""
+        self._due.pop(key, None)
+
+    def _prune(self) -> None:
+        heap = self._heap
+        while heap and self._due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_due(self) -> Optional[float]:
+        """Ближайший срок или None, если расписание пусто."""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def wait_time(self) -> Optional[float]:
+        """Сколько секунд до ближайшего срока."""
+        due = self.next_due()
+        return None if due is None else max(due - self.clock(), 0.0)
+
+    def pop_due(self) -> List[Tuple[Hashable, float]]:
+        """
+        Извлекает все наступившие сроки: пары (ключ, срок).
+        Извлечённые ключи не в расписании, пока их не добавят снова.
+        """
+        now = self.clock()
+        ready = []
+        while True:
+            self._prune()
+            if not self._heap or self._heap[0][0] > now:
+                return ready
+            due, _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            ready.append((key, due))
@@ -0,0 +1,179 @@
+"""Отправка сообщений в Telegram с учётом ограничений частоты."""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+import telegram
+from telegram import Bot
+
+from circuit_breaker import CircuitBreaker
+from exeptions import (BotException, TelegramFloodError,
+                       TransientNetworkError)
+from metrics import MESSAGES_SENT, STAGE_SECONDS
+from settings import (TELEGRAM_CHAT_RATE, TELEGRAM_GLOBAL_RATE,
+                      TELEGRAM_MAX_MESSAGE_LENGTH, TELEGRAM_MAX_RETRIES)
+
+logger = logging.getLogger(__name__)
+
+ChatId = Union[int, str]
+MESSAGE_SEPARATOR = '\n\n'
+
+
+class TokenBucket:
+    """Потокобезопасный token bucket: `rate` токенов в секунду."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Забирает токен и возвращает, сколько нужно подождать."""
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self) -> None:
+        """Блокирует поток до получения токена."""
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+
+    @property
+    def idle(self) -> bool:
+        """Ведро полное — за ним можно не следить."""
+        with self._lock:
+            self._refill()
+            return self.tokens >= self.capacity
+
+
+def coalesce(messages: List[str],
+             max_length: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> List[str]:
+    """Склеивает сообщения в как можно меньшее число частей."""
+    parts: List[str] = []
+    for message in messages:
+        if parts and (len(parts[-1]) + len(MESSAGE_SEPARATOR)
+                      + len(message) <= max_length):
+            parts[-1] = f'{parts[-1]}{MESSAGE_SEPARATOR}{message}'
+        else:
+            parts.extend(
+                message[i:i + max_length]
+                for i in range(0, max(len(message), 1), max_length)
+            )
+    return parts
+
+
+class TelegramSender:
+    """
+    Отправляет сообщения в Telegram, соблюдая общий лимит бота
+    и лимит на чат, склеивает сообщения одному чату
+    и повторяет отправку ровно через retry_after при флуд-контроле.
+    """
+
+    max_chat_buckets = 10000
+
+    def __init__(self, global_rate: float = TELEGRAM_GLOBAL_RATE,
+                 chat_rate: float = TELEGRAM_CHAT_RATE,
+                 max_retries: int = TELEGRAM_MAX_RETRIES,
+                 sleep: Callable[[float], None] = time.sleep,
+                 breaker: Optional[CircuitBreaker] = None) -> None:
+        self.breaker = breaker
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.global_bucket = TokenBucket(global_rate, sleep=sleep)
+        self._chat_buckets: Dict[ChatId, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _chat_bucket(self, chat_id: ChatId) -> TokenBucket:
+        with self._lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                if len(self._chat_buckets) >= self.max_chat_buckets:
+                    self._chat_buckets = {
+                        chat: chat_bucket
+                        for chat, chat_bucket in self._chat_buckets.items()
+                        if not chat_bucket.idle
+                    }
+                bucket = TokenBucket(self.chat_rate, sleep=self.sleep)
+                self._chat_buckets[chat_id] = bucket
+            return bucket
+
+    @STAGE_SECONDS.time(stage='telegram_send')
+    def send_one(self, bot: Bot, chat_id: ChatId,
+                 text: str) -> telegram.Message:
+        """Отправляет одно сообщение с повторами при флуд-контроле."""
+        bucket = self._chat_bucket(chat_id)
+        retry_after = None
+        for _ in range(self.max_retries + 1):
+            if self.breaker is not None:
+                self.breaker.before_call()
+            bucket.acquire()
+            self.global_bucket.acquire()
+            try:
+                sent = bot.send_message(chat_id, text)
+                MESSAGES_SENT.inc()
+                self._record(success=True)
+                return sent
+            except telegram.error.RetryAfter as error:
+                self._record(success=True)
+                logger.warning(
+                    f'Флуд-контроль Telegram, повтор через '
+                    f'{error.retry_after} с'
+                )
+                retry_after = error.retry_after
+                self.sleep(retry_after)
+            except telegram.error.BadRequest:
+                self._record(success=True)
+                raise BotException('Ошибка отправки сообщения в Telegram!')
+            except telegram.error.NetworkError:
+                self._record(success=False)
+                raise TransientNetworkError(
+                    'Ошибка отправки сообщения в Telegram!'
+                )
+            except telegram.TelegramError:
+                self._record(success=True)
+                raise BotException('Ошибка отправки сообщения в Telegram!')
+        raise TelegramFloodError(
+            'Telegram не принял сообщение после повторов!', retry_after
+        )
+
+    def _record(self, success: bool) -> None:
+        """
+        Сообщает выключателю исход обращения. Отказ по конкретному
+        сообщению и флуд-контроль — ответ живого сервиса, а не сбой.
+        """
+        if self.breaker is None:
+            return
+        if success:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def send(self, bot: Bot, chat_id: ChatId,
+             messages: List[str]) -> Optional[telegram.Message]:
+        """
+        Отправляет сообщения чату, склеивая их.
+        Возвращает последнее отправленное сообщение.
+        """
+        sent = None
+        for text in coalesce(messages):
+            sent = self.send_one(bot, chat_id, text)
+        return sent
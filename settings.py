@@ -1,6 +1,99 @@
 from typing import Dict, List, Union
 
 RETRY_TIME = 600
+# Файл лога, его максимальный размер в байтах и число архивов.
+LOG_FILE = 'my_logger.log'
+LOG_MAX_BYTES = 5000000
+LOG_BACKUP_COUNT = 5
+# Сколько подписок опрашиваются одновременно в асинхронном движке.
+ENGINE_CONCURRENCY = 64
+# Таймауты (в секундах) и размер пула соединений к API Практикума.
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+HTTP_POOL_SIZE = 10
+# За сколько секунд до очередного опроса прогревать соединение.
+WARMUP_LEAD = 5
+# Файл с курсорами current_date и период его сохранения движком.
+CHECKPOINT_FILE = 'checkpoint.json'
+CHECKPOINT_INTERVAL = 30
+# Файл с последними доставленными статусами работ.
+STATUS_INDEX_FILE = 'statuses.json'
+# Снимок состояния для тёплого перезапуска и сколько (с) ждать
+# отправки очереди при остановке.
+SNAPSHOT_FILE = 'snapshot.json'
+# Последние статусы для команд /status и /history в движке подписок.
+STATE_FILE = 'state.json'
+SHUTDOWN_TIMEOUT = 30
+# Журнал всех смен статусов для аналитики.
+TIMELINE_FILE = 'timeline.bin'
+# Размер кэша ошибок и время (в секундах), через которое
+# повторившаяся ошибка снова отправляется в Telegram.
+ERROR_CACHE_SIZE = 256
+ERROR_CACHE_TTL = 3600
+SUBSCRIPTION_ERROR_CACHE_SIZE = 16
+# Границы адаптивного интервала опроса (в секундах), множитель
+# экспоненциального отступа и доля случайного разброса паузы.
+POLL_MIN_INTERVAL = 60
+POLL_MAX_INTERVAL = 3600
+POLL_BACKOFF_FACTOR = 2
+POLL_JITTER = 0.1
+# Ограничения Telegram Bot API: сообщений в секунду на бота
+# и на один чат, максимальная длина сообщения, число повторов.
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_CHAT_RATE = 1
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+TELEGRAM_MAX_RETRIES = 3
+# Очередь исходящих сообщений: число потоков отправки, сколько чатов
+# может ждать отправки, сколько сообщений копится на чат и что делать
+# при переполнении ('drop_oldest' или 'block').
+DELIVERY_WORKERS = 4
+DELIVERY_QUEUE_SIZE = 1000
+DELIVERY_MAX_BATCH = 20
+DELIVERY_OVERFLOW = 'drop_oldest'
+# Повтор отправки после временного сбоя Telegram: первая пауза (с)
+# и её потолок (с); пауза удваивается с каждой неудачей подряд.
+DELIVERY_RETRY_INITIAL = 1
+DELIVERY_RETRY_MAX = 300
+# Соединения с Bot API: размер пула keep-alive (одновременных запросов
+# к api.telegram.org) и таймауты (с) подключения и чтения.
+TELEGRAM_POOL_SIZE = DELIVERY_WORKERS + 2
+TELEGRAM_CONNECT_TIMEOUT = 5
+TELEGRAM_READ_TIMEOUT = 10
+# Журнал исходящих сообщений: файл SQLite, размер пачки подтверждений,
+# как часто (с) их фиксировать и сколько (с) хранить доставленные.
+OUTBOX_FILE = 'outbox.sqlite3'
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_FLUSH_INTERVAL = 1.0
+OUTBOX_RETENTION = 86400
+# Выключатели внешних сервисов: сколько сбоев подряд размыкают цепь
+# и через сколько секунд пробовать сервис снова.
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RECOVERY_TIMEOUT = 60
+# Быстрые повторы после временных ошибок: первая пауза (с), множитель,
+# потолок паузы (с) и число быстрых попыток, дальше — обычный интервал.
+NETWORK_RETRY = (2, 2, 60, 6)
+UPSTREAM_RETRY = (5, 2, 120, 5)
+PAYLOAD_RETRY = (30, 2, 300, 3)
+# Локальный HTTP-эндпоинт метрик Prometheus (0 — не запускать).
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9108
+# Команды /status и /history: включены ли, таймаут long polling
+# getUpdates в секундах и сколько смен статуса помнить на чат.
+COMMANDS_ENABLED = True
+COMMANDS_POLL_TIMEOUT = 30
+HISTORY_SIZE = 50
+# Профилирование по запросу: файл отчётов, профилировать каждую
+# N-ю итерацию, как часто (с) писать отчёт и сколько строк в топах.
+PROFILE_FILE = 'profile.log'
+PROFILE_SAMPLE_EVERY = 1
+PROFILE_DUMP_INTERVAL = 300
+PROFILE_TOP = 20
+# Супервизор воркеров: виртуальных узлов на воркер в кольце
+# консистентного хеширования, период проверки воркеров и
+# максимальная пауза перед перезапуском упавшего воркера (в секундах).
+SUPERVISOR_VNODES = 100
+SUPERVISOR_CHECK_INTERVAL = 1
+SUPERVISOR_MAX_BACKOFF = 60
 
 HOMEWORK_STATUSES = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
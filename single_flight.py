@@ -0,0 +1,54 @@
+"""Объединение одновременных запросов с одинаковым ключом."""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from metrics import COALESCED_FETCHES
+
+
+class _Call:
+    """Выполняющийся вызов и его результат."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Выполняет функцию один раз для всех одновременных вызовов
+    с одним ключом: остальные ждут и получают тот же результат
+    или то же исключение. Результат не кэшируется — следующий
+    вызов после завершения снова идёт в функцию.
+    """
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable, *args) -> Any:
+        """Вызывает `func(*args)` или присоединяется к идущему вызову."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            COALESCED_FETCHES.inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
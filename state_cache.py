@@ -0,0 +1,91 @@
+"""Кэш последних статусов и истории их смены для ответов на команды."""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Union
+
+from settings import HISTORY_SIZE, CustomList
+from status_index import homework_key
+
+ChatId = Union[int, str]
+
+
+class Entry(NamedTuple):
+    """Статус работы в момент наблюдения."""
+
+    name: str
+    status: str
+    observed: float
+
+
+class StateCache:
+    """
+    Хранит по каждому чату последние статусы работ и ограниченную
+    историю смен статуса. Команды бота отвечают отсюда,
+    не обращаясь к API Практикума. API присылает только изменения,
+    поэтому кэш переживает перезапуск через `snapshot`/`restore`.
+    """
+
+    def __init__(self, history_size: int = HISTORY_SIZE) -> None:
+        self.history_size = history_size
+        self._latest: Dict[str, Dict[object, Entry]] = {}
+        self._history: Dict[str, Deque[Entry]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, chat_id: ChatId, homeworks: CustomList) -> None:
+        """Учитывает работы из очередного ответа API."""
+        if not homeworks:
+            return
+        chat = str(chat_id)
+        now = time.time()
+        with self._lock:
+            latest = self._latest.setdefault(chat, {})
+            history = self._history.setdefault(
+                chat, deque(maxlen=self.history_size)
+            )
+            for homework in homeworks:
+                entry = Entry(homework.get('homework_name'),
+                              homework.get('status'), now)
+                key = homework_key(homework)
+                previous = latest.get(key)
+                if previous is None or previous.status != entry.status:
+                    history.append(entry)
+                latest[key] = entry
+
+    def latest(self, chat_id: ChatId) -> List[Entry]:
+        """Последние известные статусы работ чата."""
+        with self._lock:
+            return list(self._latest.get(str(chat_id), {}).values())
+
+    def history(self, chat_id: ChatId) -> List[Entry]:
+        """История смен статусов чата, от старых к новым."""
+        with self._lock:
+            return list(self._history.get(str(chat_id), ()))
+
+    def snapshot(self) -> Dict[str, Dict[str, List[List[Any]]]]:
+        """Содержимое кэша в виде, пригодном для JSON."""
+        with self._lock:
+            return {
+                chat: {
+                    'latest': [[key, *entry]
+                               for key, entry in latest.items()],
+                    'history': [list(entry)
+                                for entry in self._history.get(chat, ())],
+                }
+                for chat, latest in self._latest.items()
+            }
+
+    def restore(self, data: Dict[str, Dict[str, List[List[Any]]]]) -> None:
+        """Восстанавливает кэш из снимка, не затирая новые данные."""
+        with self._lock:
+            for chat, state in data.items():
+                latest = self._latest.setdefault(chat, {})
+                for key, *entry in state.get('latest', ()):
+                    latest.setdefault(key, Entry(*entry))
+                history = self._history.setdefault(
+                    chat, deque(maxlen=self.history_size)
+                )
+                if not history:
+                    history.extend(
+                        Entry(*entry) for entry in state.get('history', ())
+                    )
@@ -0,0 +1,84 @@
+"""Индекс последних известных статусов домашних работ."""
+import json
+import logging
+import sys
+import threading
+from typing import Dict, Optional, Union
+
+from checkpoint import atomic_write
+from settings import CustomList
+
+logger = logging.getLogger(__name__)
+
+Key = Union[int, str]
+
+
+def homework_key(homework: Dict[str, Union[str, int]]) -> Key:
+    """Возвращает ключ работы: id, а при его отсутствии — имя."""
+    key = homework.get('id')
+    if key is None:
+        key = homework.get('homework_name')
+    return key
+
+
+class StatusIndex:
+    """
+    Хранит для каждой работы последний доставленный статус,
+    чтобы отправлялись только настоящие смены статуса.
+    Статусы интернируются: на работу приходится ключ и ссылка.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._statuses: Dict[Key, str] = self._load() if path else {}
+
+    def _load(self) -> Dict[Key, str]:
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            logger.error(f'Не удалось прочитать индекс {self.path}: {err}')
+            return {}
+        return {
+            int(key) if key.isdigit() else key: sys.intern(status)
+            for key, status in data.items()
+        }
+
+    def changed(self, homeworks: CustomList) -> CustomList:
+        """Отбирает за один проход работы, статус которых изменился."""
+        statuses = self._statuses
+        return [
+            homework for homework in homeworks
+            if statuses.get(homework_key(homework)) != homework.get('status')
+        ]
+
+    def remember(self, homework: Dict[str, Union[str, int]]) -> None:
+        """Запоминает доставленный статус работы."""
+        status = homework.get('status')
+        if not isinstance(status, str):
+            return
+        with self._lock:
+            self._statuses[homework_key(homework)] = sys.intern(status)
+            self._dirty = True
+
+    def get(self, key: Key) -> Optional[str]:
+        """Возвращает последний известный статус работы."""
+        return self._statuses.get(key)
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    def flush(self) -> None:
+        """Сохраняет индекс на диск, если задан путь и есть изменения."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._statuses, ensure_ascii=False)
+            self._dirty = False
+        atomic_write(self.path, data)
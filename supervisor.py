@@ -0,0 +1,265 @@
+"""Супервизор: делит подписки между процессами-воркерами движка."""
+import bisect
+import glob
+import hashlib
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+import engine
+import homework
+from checkpoint import Checkpoint
+from circuit_breaker import CircuitBreaker
+from exeptions import BotException
+from log_config import reset_logging, setup_logging
+from sender import TelegramSender
+from settings import (CHECKPOINT_FILE, METRICS_PORT, OUTBOX_FILE, STATE_FILE,
+                      SUPERVISOR_CHECK_INTERVAL, SUPERVISOR_MAX_BACKOFF,
+                      SUPERVISOR_VNODES, TELEGRAM_GLOBAL_RATE, TIMELINE_FILE)
+
+logger = logging.getLogger(__name__)
+
+Shard = List[Tuple[str, object]]
+
+
+def ring_hash(key: str) -> int:
+    """Позиция ключа на кольце."""
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """
+    Консистентное хеширование с виртуальными узлами: при изменении
+    числа узлов переезжает только ~1/N ключей.
+    """
+
+    def __init__(self, nodes: Iterable[int],
+                 vnodes: int = SUPERVISOR_VNODES) -> None:
+        self.vnodes = vnodes
+        self._points: List[Tuple[int, int]] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[int]:
+        """Узлы кольца."""
+        return sorted({node for _, node in self._points})
+
+    def add(self, node: int) -> None:
+        """Добавляет узел."""
+        for replica in range(self.vnodes):
+            bisect.insort(self._points, (ring_hash(f'{node}:{replica}'), node))
+
+    def remove(self, node: int) -> None:
+        """Удаляет узел."""
+        self._points = [point for point in self._points if point[1] != node]
+
+    def node_for(self, key: str) -> int:
+        """Узел, отвечающий за ключ."""
+        if not self._points:
+            raise LookupError('На кольце нет узлов')
+        index = bisect.bisect(self._points, (ring_hash(key), -1))
+        return self._points[index % len(self._points)][1]
+
+
+def shard(subscriptions: Iterable[Tuple[str, object]],
+          ring: HashRing) -> Dict[int, Shard]:
+    """Раскладывает подписки по узлам кольца."""
+    shards: Dict[int, Shard] = {node: [] for node in ring.nodes}
+    for token, chat_id in subscriptions:
+        shards[ring.node_for(token)].append((token, chat_id))
+    return shards
+
+
+def worker_path(path: str, index: int) -> str:
+    """Собственный файл воркера: checkpoint.json -> checkpoint-1.json."""
+    base, ext = os.path.splitext(path)
+    return f'{base}-{index}{ext}'
+
+
+def run_worker(index: int, telegram_token: str, subscriptions: Shard,
+               global_rate: float = TELEGRAM_GLOBAL_RATE) -> None:
+    """
+    Точка входа процесса-воркера. `global_rate` — доля общего
+    лимита бота: токен у всех воркеров один.
+    """
+    # Обработчики супервизора наследуются при fork, сбрасываем их.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for signum in (signal.SIGINT, signal.SIGTTIN, signal.SIGTTOU):
+        signal.signal(signum, signal.SIG_IGN)
+    reset_logging()
+    setup_logging()
+    homework.SENDER = TelegramSender(global_rate=global_rate,
+                                     breaker=CircuitBreaker('telegram'))
+    checkpoint = Checkpoint(worker_path(CHECKPOINT_FILE, index))
+    base, ext = os.path.splitext(CHECKPOINT_FILE)
+    for path in glob.glob(f'{base}*{ext}'):
+        if path != checkpoint.path:
+            checkpoint.merge(path)
+    engine.run(
+        telegram_token,
+        [engine.Subscription(token, chat_id)
+         for token, chat_id in subscriptions],
+        checkpoint,
+        metrics_port=METRICS_PORT + 1 + index if METRICS_PORT else 0,
+        commands=False,
+        outbox_path=worker_path(OUTBOX_FILE, index),
+        timeline_path=worker_path(TIMELINE_FILE, index),
+        state_path=worker_path(STATE_FILE, index),
+    )
+
+
+class Supervisor:
+    """
+    Запускает N воркеров, перезапускает упавших с нарастающей паузой,
+    по SIGTTIN/SIGTTOU добавляет или убирает воркер и перезапускает
+    только те, чей набор подписок изменился. Общий лимит Telegram
+    делится между воркерами поровну.
+    """
+
+    def __init__(self, telegram_token: str,
+                 subscriptions: Iterable[Tuple[str, object]],
+                 workers: int) -> None:
+        self.telegram_token = telegram_token
+        self.subscriptions = list(subscriptions)
+        self.ring = HashRing(range(workers))
+        self.shards = shard(self.subscriptions, self.ring)
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self.crashes: Dict[int, int] = {}
+        self.started_at: Dict[int, float] = {}
+        self.restart_at: Dict[int, float] = {}
+        self.rates: Dict[int, float] = {}
+        self._stopping = False
+        self._resize: Optional[int] = None
+
+    def rate_share(self) -> float:
+        """Доля общего лимита отправки бота на один воркер."""
+        return TELEGRAM_GLOBAL_RATE / max(len(self.ring.nodes), 1)
+
+    def spawn(self, index: int) -> None:
+        """Запускает воркер с его долей подписок и лимита отправки."""
+        rate = self.rate_share()
+        process = multiprocessing.Process(
+            target=run_worker, name=f'worker-{index}',
+            args=(index, self.telegram_token, self.shards[index], rate),
+        )
+        process.start()
+        self.processes[index] = process
+        self.rates[index] = rate
+        self.started_at[index] = time.monotonic()
+        logger.info(f'Воркер {index} (pid {process.pid}): '
+                    f'подписок {len(self.shards[index])}')
+
+    def terminate(self, index: int, timeout: float = 10) -> None:
+        """Останавливает воркер."""
+        process = self.processes.pop(index, None)
+        if process is None:
+            return
+        process.terminate()
+        process.join(timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    def check(self) -> None:
+        """Перезапускает упавшие воркеры, не чаще паузы отступа."""
+        now = time.monotonic()
+        for index in self.ring.nodes:
+            process = self.processes.get(index)
+            if process is not None and process.is_alive():
+                stable = now - self.started_at[index] > SUPERVISOR_MAX_BACKOFF
+                if stable:
+                    self.crashes[index] = 0
+                continue
+            if process is not None:
+                self.processes.pop(index)
+                crashes = self.crashes.get(index, 0) + 1
+                self.crashes[index] = crashes
+                delay = min(2 ** crashes, SUPERVISOR_MAX_BACKOFF)
+                self.restart_at[index] = now + delay
+                logger.error(f'Воркер {index} завершился с кодом '
+                             f'{process.exitcode}, перезапуск через {delay} с')
+            if now >= self.restart_at.get(index, 0):
+                self.spawn(index)
+
+    def resize(self, workers: int) -> List[int]:
+        """
+        Меняет число воркеров. Возвращает воркеры, чьи подписки
+        изменились или чья доля лимита стала меньше, — они
+        перезапущены.
+        """
+        workers = max(workers, 1)
+        current = self.ring.nodes
+        for node in current[workers:]:
+            self.ring.remove(node)
+            self.terminate(node)
+        for node in range(len(current), workers):
+            self.ring.add(node)
+        shards = shard(self.subscriptions, self.ring)
+        owners = {token: node for node, items in self.shards.items()
+                  for token, _ in items}
+        moved = sum(1 for node, items in shards.items()
+                    for token, _ in items if owners.get(token) != node)
+        share = self.rate_share()
+        changed = [node for node in shards
+                   if shards[node] != self.shards.get(node)
+                   or self.rates.get(node, 0.0) > share]
+        self.shards = shards
+        logger.info(f'Воркеров: {workers}, переехало подписок: {moved}')
+        for node in changed:
+            self.terminate(node)
+            self.spawn(node)
+        return changed
+
+    def _on_signal(self, signum, frame) -> None:
+        if signum == signal.SIGTTIN:
+            self._resize = len(self.ring.nodes) + 1
+        elif signum == signal.SIGTTOU:
+            self._resize = len(self.ring.nodes) - 1
+        else:
+            self._stopping = True
+
+    def run(self) -> None:
+        """Основной цикл супервизора."""
+        for signum in (signal.SIGTERM, signal.SIGINT,
+                       signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, self._on_signal)
+        for index in self.ring.nodes:
+            self.spawn(index)
+        try:
+            while not self._stopping:
+                if self._resize is not None:
+                    workers, self._resize = self._resize, None
+                    self.resize(workers)
+                self.check()
+                time.sleep(SUPERVISOR_CHECK_INTERVAL)
+        finally:
+            for index in list(self.processes):
+                self.terminate(index)
+
+
+def main() -> None:
+    """Запускает супервизор воркеров."""
+    setup_logging()
+    load_dotenv()
+    telegram_token = os.getenv('TELEGRAM_TOKEN')
+    subscriptions = engine.load_subscriptions(os.getenv('SUBSCRIPTIONS_FILE'))
+    if not telegram_token or not all(
+        sub.token and sub.chat_id for sub in subscriptions
+    ):
+        raise BotException('Проверьте переменные окружения!')
+    workers = int(os.getenv('WORKERS') or os.cpu_count() or 1)
+    Supervisor(
+        telegram_token,
+        [(sub.token, sub.chat_id) for sub in subscriptions],
+        workers,
+    ).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import bot_transport
+import metrics
+
+
+class SlowBotAPI(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = 0.2
+    ports = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.lock:
+            self.ports.add(self.client_address[1])
+        time.sleep(self.delay)
+        body = b'{"ok": true, "result": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPooledRequest:
+
+    def test_api_method(self):
+        assert bot_transport.api_method(
+            'https://api.telegram.org/bot1:abc/sendMessage'
+        ) == 'sendMessage'
+
+    def test_sends_in_parallel_over_pool(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowBotAPI)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_port}/bot1:abc/sendMessage'
+        request = bot_transport.PooledRequest(pool_size=4)
+        before = metrics.TELEGRAM_REQUEST_SECONDS.samples()
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(
+                    lambda n: request.post(url, {'text': str(n)}), range(8)
+                ))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert results == [True] * 8
+        assert elapsed < 8 * SlowBotAPI.delay / 2, (
+            'Запросы должны выполняться параллельно в пределах пула'
+        )
+        assert len(SlowBotAPI.ports) <= 4, (
+            'Соединения должны переиспользоваться, а не открываться заново'
+        )
+        assert metrics.TELEGRAM_REQUEST_SECONDS.samples() != before, (
+            'Длительность запросов должна попадать в метрики'
+        )
@@ -0,0 +1,41 @@
+import checkpoint
+
+
+class TestCheckpoint:
+
+    def test_cursor_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'checkpoint.json')
+        key = checkpoint.token_key('secret')
+        assert 'secret' not in key, 'Токен не должен попадать в чекпоинт'
+
+        cursors = checkpoint.Checkpoint(path)
+        assert cursors.get(key) is None
+        cursors.set(key, 1000)
+        cursors.flush()
+
+        restored = checkpoint.Checkpoint(path)
+        assert restored.get(key) == 1000, (
+            'Курсор должен восстанавливаться после перезапуска'
+        )
+
+    def test_atomic_write_leaves_no_temp_files(self, tmp_path):
+        path = tmp_path / 'data.json'
+        checkpoint.atomic_write(str(path), '{}')
+        checkpoint.atomic_write(str(path), '{"a": 1}')
+        assert path.read_text() == '{"a": 1}'
+        assert [p.name for p in tmp_path.iterdir()] == ['data.json']
+
+    def test_broken_file_starts_empty(self, tmp_path):
+        path = tmp_path / 'checkpoint.json'
+        path.write_text('not json')
+        assert checkpoint.Checkpoint(str(path)).get('key') is None
+
+    def test_snapshot_roundtrip(self, tmp_path):
+        path = str(tmp_path / 'snapshot.json')
+        assert checkpoint.load_snapshot(path) == {}
+        checkpoint.save_snapshot(path, {'cursor': 42})
+        state = checkpoint.load_snapshot(path)
+        assert state['cursor'] == 42
+        assert 0 <= state['age'] < 60, (
+            'Снимок должен сообщать свой возраст'
+        )
@@ -0,0 +1,85 @@
+import pytest
+import telegram
+from utils import FakeClock
+
+import circuit_breaker
+import sender
+from exeptions import BotException, CircuitOpenError
+
+
+def make_breaker(probe=None):
+    clock = FakeClock()
+    breaker = circuit_breaker.CircuitBreaker(
+        'test', failure_threshold=2, recovery_timeout=10,
+        probe=probe, clock=clock,
+    )
+    return breaker, clock
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self):
+        breaker, clock = make_breaker()
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == circuit_breaker.OPEN
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.before_call()
+        assert error.value.retry_after == 10, (
+            'Ошибка должна сообщать, когда можно повторить'
+        )
+
+    def test_single_trial_call_in_half_open(self):
+        breaker, clock = make_breaker()
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+        assert breaker.state == circuit_breaker.HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.before_call()
+        assert error.value.retry_after == 10, (
+            'Пока идёт проба, остальные не должны повторять без паузы'
+        )
+        breaker.record_success()
+        assert breaker.state == circuit_breaker.CLOSED
+
+    def test_probe_decides_recovery(self):
+        healthy = []
+        breaker, clock = make_breaker(probe=lambda: bool(healthy))
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.state == circuit_breaker.OPEN, (
+            'Неудачная проба должна снова размыкать цепь'
+        )
+        clock.now = 20
+        healthy.append(True)
+        breaker.before_call()
+        assert breaker.state == circuit_breaker.CLOSED
+
+
+class TestSenderBreaker:
+
+    def test_network_errors_open_circuit(self):
+        class DownBot:
+            calls = 0
+
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                DownBot.calls += 1
+                raise telegram.error.TimedOut()
+
+        breaker, _ = make_breaker()
+        telegram_sender = sender.TelegramSender(sleep=lambda s: None,
+                                                breaker=breaker)
+        for _ in range(2):
+            with pytest.raises(BotException):
+                telegram_sender.send(DownBot(), 1, ['текст'])
+        with pytest.raises(CircuitOpenError):
+            telegram_sender.send(DownBot(), 1, ['текст'])
+        assert DownBot.calls == 2, (
+            'При разомкнутой цепи Telegram не должен вызываться'
+        )
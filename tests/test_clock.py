@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+import benchmark
+import clock
+import homework
+from settings import POLL_JITTER, POLL_MIN_INTERVAL
+
+
+class TestClock:
+
+    def test_virtual_sleep_advances_time(self):
+        virtual = clock.VirtualClock(start=1000)
+        assert not virtual.sleep(600)
+        assert virtual.time() == 1600
+        assert virtual.monotonic() == 600, (
+            'Виртуальный sleep должен сдвигать время, а не ждать'
+        )
+        stop = threading.Event()
+        stop.set()
+        assert virtual.sleep(600, stop), (
+            'Ожидание должно прерываться событием остановки'
+        )
+        assert virtual.time() == 1600
+
+    def test_system_sleep_interrupted_by_stop(self):
+        stop = threading.Event()
+        stop.set()
+        assert clock.SystemClock().sleep(60, stop)
+
+
+class TestBenchmark:
+
+    def test_simulated_cycles(self):
+        saved = homework.CLOCK
+        report = benchmark.run(cycles=50)
+        assert report['cycles'] == 50
+        shortest = POLL_MIN_INTERVAL * (1 - POLL_JITTER)
+        assert report['simulated_hours'] >= 50 * shortest / 3600, (
+            'Циклы должны идти по виртуальному времени'
+        )
+        again = benchmark.run(cycles=50)
+        assert again['simulated_hours'] == pytest.approx(
+            report['simulated_hours']
+        ), (
+            'Прогоны с одним зерном должны повторяться'
+        )
+        assert report['cpu_us_per_cycle'] > 0
+        assert homework.CLOCK is saved, (
+            'После прогона глобальные объекты должны восстанавливаться'
+        )
+        assert not homework.STOP.is_set()
@@ -0,0 +1,81 @@
+import json
+from types import SimpleNamespace
+
+import commands
+import state_cache
+
+
+class MockMessage:
+
+    def __init__(self):
+        self.replies = []
+
+    def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+def make_update(chat_id):
+    return SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id),
+                           effective_message=MockMessage())
+
+
+class TestCommands:
+
+    def test_status_and_history_from_cache(self):
+        state = state_cache.StateCache()
+        state.update('42', [{'id': 1, 'homework_name': 'hw1',
+                             'status': 'reviewing'}])
+        state.update('42', [{'id': 1, 'homework_name': 'hw1',
+                             'status': 'approved'}])
+        state.update('42', [{'id': 1, 'homework_name': 'hw1',
+                             'status': 'approved'}])
+        context = SimpleNamespace(bot_data={'state': state})
+
+        update = make_update(42)
+        commands.status_command(update, context)
+        reply = update.effective_message.replies[0]
+        assert reply == '"hw1": Работа проверена: ревьюеру всё понравилось. Ура!'
+
+        update = make_update(42)
+        commands.history_command(update, context)
+        reply = update.effective_message.replies[0]
+        assert reply.count('"hw1"') == 2, (
+            'История должна содержать только смены статуса'
+        )
+
+    def test_other_chat_sees_nothing(self):
+        state = state_cache.StateCache()
+        state.update(1, [{'id': 1, 'homework_name': 'hw',
+                          'status': 'approved'}])
+        update = make_update(2)
+        commands.status_command(update,
+                                SimpleNamespace(bot_data={'state': state}))
+        assert update.effective_message.replies == [commands.NO_DATA]
+
+    def test_history_is_bounded(self):
+        state = state_cache.StateCache(history_size=3)
+        for number in range(10):
+            status = 'approved' if number % 2 else 'rejected'
+            state.update(1, [{'id': 1, 'homework_name': 'hw',
+                              'status': status}])
+        assert len(state.history(1)) == 3
+
+    def test_cache_survives_restart(self):
+        state = state_cache.StateCache()
+        state.update(1, [{'id': 7, 'homework_name': 'hw',
+                          'status': 'reviewing'}])
+        state.update(1, [{'id': 7, 'homework_name': 'hw',
+                          'status': 'approved'}])
+        snapshot = json.loads(json.dumps(state.snapshot()))
+
+        restored = state_cache.StateCache()
+        restored.restore(snapshot)
+        assert restored.latest(1) == state.latest(1), (
+            '/status должен отвечать сразу после перезапуска'
+        )
+        assert restored.history(1) == state.history(1)
+        restored.update(1, [{'id': 7, 'homework_name': 'hw',
+                             'status': 'approved'}])
+        assert len(restored.history(1)) == 2, (
+            'Ключ работы должен восстанавливаться без изменения типа'
+        )
@@ -0,0 +1,155 @@
+import threading
+from types import SimpleNamespace
+
+import delivery
+from circuit_breaker import CircuitBreaker
+from exeptions import BotException, TransientNetworkError
+from sender import TelegramSender
+
+
+class TestDeliveryQueue:
+
+    def test_messages_are_delivered_in_background(self):
+        sent = []
+        queue = delivery.DeliveryQueue(
+            lambda bot, chat_id, messages: sent.append((chat_id, messages)),
+            workers=2,
+        ).start()
+        queue.put(None, 1, ['a'])
+        queue.put(None, 2, ['b'])
+        assert queue.join(timeout=5)
+        queue.stop(timeout=5)
+        assert sorted(sent) == [(1, ['a']), (2, ['b'])]
+        assert queue.stats()['delivered'] == 2
+
+    def test_pending_messages_for_chat_are_coalesced(self):
+        release = threading.Event()
+        sent = []
+
+        def slow_send(bot, chat_id, messages):
+            release.wait(5)
+            sent.append(list(messages))
+
+        queue = delivery.DeliveryQueue(slow_send, workers=1).start()
+        queue.put(None, 1, ['first'])
+        queue.put(None, 2, ['x'])
+        queue.put(None, 2, ['y'])
+        stats = queue.stats()
+        release.set()
+        queue.stop(timeout=5)
+        assert ['x', 'y'] in sent, (
+            'Сообщения одному чату в очереди должны склеиваться'
+        )
+        assert stats['coalesced'] == 1
+
+    def test_overflow_drops_oldest(self):
+        queue = delivery.DeliveryQueue(lambda *args: None, maxsize=2)
+        for chat_id in range(4):
+            queue.put(None, chat_id, [str(chat_id)])
+        stats = queue.stats()
+        assert stats['depth'] == 2, 'Очередь не должна превышать maxsize'
+        assert stats['dropped'] == 2
+        assert list(queue._pending) == [2, 3]
+
+    def test_failed_send_is_counted(self):
+        def failing_send(bot, chat_id, messages):
+            raise BotException('boom')
+
+        queue = delivery.DeliveryQueue(failing_send, workers=1).start()
+        queue.put(None, 1, ['a'])
+        queue.stop(timeout=5)
+        assert queue.stats()['failed'] == 1
+
+    def test_undeliverable_ids_are_reported(self):
+        def failing_send(bot, chat_id, messages):
+            raise BotException('chat not found')
+
+        failed = []
+        queue = delivery.DeliveryQueue(failing_send, maxsize=2, max_batch=2,
+                                       on_failed=failed.extend)
+        queue.put(None, 1, ['a'], [1])
+        queue.put(None, 2, ['b', 'c', 'd'], [2, 3, 4])
+        queue.put(None, 3, ['e'], [5])
+        assert sorted(failed) == [1, 2], (
+            'Вытесненные и обрезанные сообщения должны помечаться в журнале'
+        )
+        queue.start()
+        queue.stop(timeout=5)
+        assert sorted(failed) == [1, 2, 3, 4, 5], (
+            'Сообщения, отклонённые Telegram, не должны повторяться вечно'
+        )
+
+    def test_delivered_ids_are_acknowledged(self):
+        acked = []
+        queue = delivery.DeliveryQueue(lambda *args: None, workers=1,
+                                       on_delivered=acked.extend).start()
+        queue.put(None, 1, ['a', 'b'], [10, 11])
+        queue.put(None, 2, ['c'])
+        queue.stop(timeout=5)
+        assert sorted(acked) == [10, 11]
+
+    def test_transient_failure_is_retried(self):
+        attempts = []
+
+        def flaky_send(bot, chat_id, messages):
+            attempts.append(list(messages))
+            if len(attempts) < 3:
+                raise TransientNetworkError('сеть недоступна')
+
+        acked = []
+        queue = delivery.DeliveryQueue(flaky_send, workers=2,
+                                       retry_initial=0.01,
+                                       on_delivered=acked.extend).start()
+        queue.put(None, 1, ['a', 'b'], [10, 11])
+        assert queue.join(timeout=5), 'Очередь должна опустеть после повторов'
+        queue.stop(timeout=5)
+        stats = queue.stats()
+        assert attempts == [['a', 'b']] * 3
+        assert (stats['retried'], stats['failed']) == (4, 0)
+        assert sorted(acked) == [10, 11], (
+            'Сообщения после временного сбоя должны быть доставлены '
+            'без перезапуска'
+        )
+
+    def test_retry_waits_for_backoff(self):
+        now = [0.0]
+        queue = delivery.DeliveryQueue(lambda *args: None, retry_initial=10,
+                                       clock=lambda: now[0])
+        queue._running = True
+        queue.put(None, 1, ['a'])
+        chat_id, bot, messages, ids = queue._take()
+        queue._in_flight.discard(chat_id)
+        queue._requeue(chat_id, bot, messages, ids,
+                       TransientNetworkError('сеть недоступна'))
+        queue.put(None, 1, ['b'])
+        assert queue._take() is None, (
+            'Повтор не должен начинаться до конца паузы'
+        )
+        assert queue._next_retry() == 10
+        now[0] = 10
+        assert queue._take()[2] == ['a', 'b'], (
+            'Неотправленная пачка должна идти раньше новых сообщений'
+        )
+
+    def test_open_breaker_defers_delivery(self):
+        breaker = CircuitBreaker('telegram', failure_threshold=1,
+                                 recovery_timeout=0.2)
+        breaker.record_failure()
+        sender = TelegramSender(global_rate=10 ** 6, chat_rate=10 ** 6,
+                                breaker=breaker)
+        sent = []
+        bot = SimpleNamespace(
+            send_message=lambda chat_id, text: sent.append(chat_id)
+        )
+        queue = delivery.DeliveryQueue(sender.send, workers=2,
+                                       retry_initial=0.01).start()
+        for chat_id in range(5):
+            queue.put(bot, chat_id, ['a'])
+        assert queue.join(timeout=5)
+        queue.stop(timeout=5)
+        stats = queue.stats()
+        assert sorted(sent) == list(range(5)), (
+            'Разомкнутый выключатель должен откладывать отправку, '
+            'а не отбрасывать её'
+        )
+        assert stats['failed'] == 0 and stats['retried'] >= 5
@@ -0,0 +1,161 @@
+import asyncio
+
+from utils import FakeClock, MockBot
+
+import checkpoint
+import engine
+import homework
+from polling import AdaptiveInterval
+
+
+def polling_interval(seconds):
+    return AdaptiveInterval(seconds, seconds, seconds, jitter=0)
+
+
+class TestPollingEngine:
+
+    def test_poll_isolated_subscriptions(self, monkeypatch):
+        def mock_fetch(token, timestamp):
+            return {
+                'homeworks': [
+                    {'homework_name': f'hw_{token}', 'status': 'approved'}
+                ],
+                'current_date': 100,
+            }
+
+        monkeypatch.setattr(homework, 'fetch_api_answer', mock_fetch)
+        bot = MockBot()
+        subscriptions = [
+            engine.Subscription('a', 1),
+            engine.Subscription('b', 2),
+        ]
+        polling = engine.PollingEngine(bot, subscriptions, concurrency=2)
+
+        async def poll_all():
+            polling._semaphore = asyncio.Semaphore(2)
+            await asyncio.gather(*(polling.poll(f) for f in polling.feeds))
+
+        asyncio.run(poll_all())
+        assert sorted(chat for chat, _ in bot.sent) == [1, 2], (
+            'Каждая подписка должна получить свои статусы'
+        )
+        for chat_id, text in bot.sent:
+            token = 'a' if chat_id == 1 else 'b'
+            assert f'hw_{token}' in text, (
+                'Статусы подписок не должны перемешиваться'
+            )
+        assert all(f.timestamp is not None for f in polling.feeds)
+
+    def test_one_fetch_fans_out_to_all_chats(self, monkeypatch):
+        calls = []
+
+        def mock_fetch(token, timestamp):
+            calls.append(token)
+            return {
+                'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+                'current_date': 100,
+            }
+
+        monkeypatch.setattr(homework, 'fetch_api_answer', mock_fetch)
+        bot = MockBot()
+        subscriptions = [
+            engine.Subscription('a', 1),
+            engine.Subscription('a', 2),
+            engine.Subscription('a', 3),
+        ]
+        polling = engine.PollingEngine(bot, subscriptions)
+        assert len(polling.feeds) == 1, (
+            'Подписки с одним токеном должны объединяться'
+        )
+
+        async def poll():
+            polling._semaphore = asyncio.Semaphore(1)
+            await polling.poll(polling.feeds[0])
+
+        asyncio.run(poll())
+        assert calls == ['a'], (
+            'На один токен должен уходить один запрос к API'
+        )
+        assert sorted(chat for chat, _ in bot.sent) == [1, 2, 3], (
+            'Ответ должен расходиться всем чатам токена'
+        )
+
+    def test_load_subscriptions_chat_ids(self, monkeypatch, tmp_path):
+        path = tmp_path / 'subs.json'
+        path.write_text(
+            '[{"token": "a", "chat_ids": [1, 2]},'
+            ' {"token": "b", "chat_id": 3}]'
+        )
+        subs = engine.load_subscriptions(str(path))
+        assert [(s.token, s.chat_id) for s in subs] == [
+            ('a', 1), ('a', 2), ('b', 3)
+        ]
+        monkeypatch.setattr(homework, 'PRACTICUM_TOKEN', 't')
+        monkeypatch.setattr(homework, 'TELEGRAM_CHAT_ID', '10, -20')
+        subs = engine.load_subscriptions(None)
+        assert [s.chat_id for s in subs] == ['10', '-20'], (
+            'TELEGRAM_CHAT_ID должен разбираться по запятым'
+        )
+
+    def test_remember_error_per_subscription(self):
+        first = engine.Subscription('a', 1)
+        second = engine.Subscription('b', 2)
+        assert first.remember_error('err')
+        assert not first.remember_error('err')
+        assert second.remember_error('err'), (
+            'Кэш ошибок должен быть своим у каждой подписки'
+        )
+
+    def test_cursor_follows_current_date(self, monkeypatch, tmp_path):
+        def mock_fetch(token, timestamp):
+            return {'homeworks': [], 'current_date': 4242}
+
+        monkeypatch.setattr(homework, 'fetch_api_answer', mock_fetch)
+        cursors = checkpoint.Checkpoint(str(tmp_path / 'cursor.json'))
+        subscription = engine.Subscription('a', 1)
+        polling = engine.PollingEngine(MockBot(), [subscription],
+                                       checkpoint=cursors)
+
+        async def poll():
+            polling._semaphore = asyncio.Semaphore(1)
+            await polling.poll(polling.feeds[0])
+
+        asyncio.run(poll())
+        assert polling.feeds[0].timestamp == 4242, (
+            'Курсор должен браться из current_date ответа API'
+        )
+        assert cursors.get(checkpoint.token_key('a')) == 4242
+
+    def test_run_spreads_feeds_over_interval(self, monkeypatch):
+        clock = FakeClock()
+        polled = []
+
+        def mock_fetch(token, timestamp):
+            polled.append((token, clock.now))
+            return {'homeworks': [], 'current_date': 100}
+
+        monkeypatch.setattr(homework, 'fetch_api_answer', mock_fetch)
+        subscriptions = [engine.Subscription(t, 1) for t in 'abcd']
+        polling = engine.PollingEngine(MockBot(), subscriptions, clock=clock)
+        for feed in polling.feeds:
+            feed.interval = polling_interval(200)
+
+        async def run():
+            polling._start_schedule()
+            while polling.schedule.next_due() < 500:
+                clock.now = polling.schedule.next_due()
+                for number, due in polling.schedule.pop_due():
+                    await polling.run_feed(number, due)
+
+        asyncio.run(run())
+        polling.close()
+        first = {}
+        for token, moment in polled:
+            first.setdefault(token, moment)
+        assert first == {'a': 0, 'b': 50, 'c': 100, 'd': 150}, (
+            'Первые опросы должны быть разложены по интервалу'
+        )
+        assert [moment for token, moment in polled if token == 'a'] == [
+            0, 200, 400
+        ], 'Каждый токен должен опрашиваться с фиксированным темпом'
+        assert len(polled) == 10
@@ -0,0 +1,91 @@
+import requests
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from utils import FakeClock
+
+import error_cache
+
+
+def connection_error(url, connection):
+    reason = NewConnectionError(
+        connection,
+        'Failed to establish a new connection: [Errno 111] Connection refused',
+    )
+    error = requests.exceptions.ConnectionError(
+        MaxRetryError(HTTPConnectionPool('127.0.0.1', 1), url, reason)
+    )
+    return ('Сбой в работе программы: Не удалось подключиться. '
+            f'Возникла ошибка: {error}')
+
+
+class TestErrorCache:
+
+    def test_fingerprint_ignores_volatile_parts(self):
+        first = error_cache.fingerprint(
+            'Эндпоинт https://a.ru/x?from_date=1 недоступен. Код 500 '
+            'в 2022-01-01T12:00:00Z, 1640995200'
+        )
+        second = error_cache.fingerprint(
+            'Эндпоинт https://a.ru/x?from_date=2  недоступен. Код 500 '
+            'в 2022-01-02T08:30:15Z, 1641112215'
+        )
+        assert first == second, (
+            'URL и метки времени не должны влиять на отпечаток ошибки'
+        )
+
+    def test_fingerprint_keeps_status_code(self):
+        server = error_cache.fingerprint('Код ответа API: 500')
+        auth = error_cache.fingerprint('Код ответа API: 401')
+        assert server != auth, (
+            'Ошибки с разными кодами ответа не должны склеиваться'
+        )
+
+    def test_fingerprint_ignores_connection_details(self):
+        connections = [HTTPConnection('127.0.0.1', 1) for _ in range(2)]
+        first = connection_error('/api/homework_statuses/?from_date=1',
+                                 connections[0])
+        second = connection_error('/api/homework_statuses/?from_date=2',
+                                  connections[1])
+        assert ' at 0x' in first and first != second
+        assert (error_cache.fingerprint(first)
+                == error_cache.fingerprint(second)), (
+            'Адреса объектов urllib3 не должны влиять на отпечаток ошибки'
+        )
+
+    def test_ttl_expiry_reports_again(self):
+        clock = FakeClock()
+        cache = error_cache.ErrorCache(maxsize=10, ttl=60, clock=clock)
+        assert cache.add('ошибка')
+        assert not cache.add('ошибка')
+        clock.now = 61
+        assert cache.add('ошибка'), (
+            'Ошибка должна снова отправляться после истечения TTL'
+        )
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_size_is_bounded(self):
+        cache = error_cache.ErrorCache(maxsize=3, ttl=60, clock=FakeClock())
+        for word in ('a', 'b', 'c', 'd', 'e'):
+            cache.add(f'ошибка {word}')
+        assert len(cache) == 3, 'Кэш не должен расти больше maxsize'
+        assert 'ошибка e' in cache
+        assert 'ошибка a' not in cache
+
+    def test_snapshot_restores_remaining_ttl(self):
+        clock = FakeClock()
+        cache = error_cache.ErrorCache(maxsize=10, ttl=60, clock=clock)
+        cache.add('старая')
+        clock.now = 50
+        cache.add('новая')
+        snapshot = cache.snapshot()
+
+        restored = error_cache.ErrorCache(maxsize=10, ttl=60,
+                                          clock=FakeClock())
+        restored.restore(snapshot, age=20)
+        assert 'старая' not in restored, (
+            'Истёкшие за время простоя ошибки не должны восстанавливаться'
+        )
+        assert not restored.add('новая'), (
+            'Восстановленная ошибка не должна отправляться повторно'
+        )
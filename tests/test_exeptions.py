@@ -0,0 +1,50 @@
+import asyncio
+from http import HTTPStatus
+
+from utils import MockBot
+
+import exeptions
+import homework
+import scheduler
+from engine import PollingEngine, Subscription
+
+
+class TestRetryPolicies:
+
+    def test_api_error_by_status(self):
+        assert homework.api_error(HTTPStatus.UNAUTHORIZED) is (
+            exeptions.AuthError
+        )
+        assert homework.api_error(HTTPStatus.BAD_GATEWAY) is (
+            exeptions.UpstreamServerError
+        )
+        assert homework.api_error(HTTPStatus.NOT_FOUND) is (
+            exeptions.ApiResponseError
+        )
+
+    def test_policies(self):
+        assert exeptions.AuthError('x').retry_policy.fatal
+        assert exeptions.TransientNetworkError('x').retry_policy.attempts
+        assert exeptions.retry_policy(ValueError()) is exeptions.REGULAR
+        assert isinstance(exeptions.MalformedPayloadError('x'), TypeError), (
+            'Ошибка формата ответа должна оставаться TypeError'
+        )
+
+    def test_fatal_error_stops_feed(self, monkeypatch):
+        def mock_fetch(token, timestamp):
+            raise exeptions.AuthError('Токен отклонён', status_code=401)
+
+        monkeypatch.setattr(homework, 'fetch_api_answer', mock_fetch)
+        bot = MockBot()
+        engine = PollingEngine(bot, [Subscription('a', 1)])
+        engine.schedule = scheduler.Scheduler()
+
+        async def run():
+            engine._semaphore = asyncio.Semaphore(1)
+            await engine.run_feed(0, engine.schedule.clock())
+
+        asyncio.run(run())
+        assert len(engine.schedule) == 0, (
+            'После фатальной ошибки токен не должен опрашиваться снова'
+        )
+        assert bot.sent, 'Подписчик должен узнать об остановке опроса'
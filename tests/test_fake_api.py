@@ -0,0 +1,46 @@
+import pytest
+
+import fake_api
+import homework
+import loadtest
+from exeptions import ApiResponseError
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    api = fake_api.FakePracticumAPI(
+        data={'token': [{'id': 1, 'homework_name': 'hw',
+                         'status': 'approved'}]},
+    )
+    server = fake_api.FakePracticumServer(api).start()
+    monkeypatch.setattr(homework, 'ENDPOINT', server.endpoint)
+    yield server
+    server.stop()
+
+
+class TestFakePracticumAPI:
+
+    def test_returns_token_data(self, fake_server):
+        response = homework.fetch_api_answer('token', 0)
+        assert response['homeworks'][0]['homework_name'] == 'hw'
+        assert isinstance(response['current_date'], int)
+
+    def test_error_rate(self, fake_server):
+        fake_server.api.error_rate = 1.0
+        with pytest.raises(ApiResponseError):
+            homework.fetch_api_answer('token', 0)
+
+
+class TestLoadTest:
+
+    def test_report(self):
+        api = fake_api.FakePracticumAPI(homeworks=2)
+        report = loadtest.run(subscriptions=5, duration=0.5, interval=0.1,
+                              concurrency=4, api=api)
+        assert report['polls'] >= 5, (
+            'Каждая подписка должна опрашиваться хотя бы раз'
+        )
+        assert report['p50_ms'] <= report['p99_ms']
+        assert api.requests == report['polls'], (
+            'Отчёт должен учитывать все запросы, дошедшие до API'
+        )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+
+import fake_api
+import homework
+import http_client
+
+
+class MockResponse:
+
+    def __init__(self, content=b'{"homeworks": []}', headers=None):
+        self.content = content
+        self.headers = headers or {}
+        self.status_code = HTTPStatus.OK
+
+
+class TestPracticumClient:
+
+    def test_get_uses_timeout_and_records_stats(self, monkeypatch):
+        client = http_client.PracticumClient(connect_timeout=1,
+                                             read_timeout=2)
+        calls = []
+
+        def mock_get(url, **kwargs):
+            calls.append(kwargs)
+            return MockResponse(headers={'Content-Length': '10'})
+
+        monkeypatch.setattr(client.session, 'get', mock_get)
+        client.get('https://example.com/', params={'from_date': 0})
+        client.get('https://example.com/', timeout=5)
+
+        assert calls[0]['timeout'] == (1, 2), (
+            'Клиент должен подставлять таймауты по умолчанию'
+        )
+        assert calls[1]['timeout'] == 5
+        stats = client.stats.snapshot()
+        assert stats['requests'] == 2
+        assert stats['wire_bytes'] == 20
+        assert stats['body_bytes'] == 2 * len(MockResponse().content)
+
+    def test_session_negotiates_gzip(self):
+        client = http_client.PracticumClient()
+        assert 'gzip' in client.session.headers['Accept-Encoding']
+        client.close()
+
+
+class TestUnchangedResponses:
+
+    def test_body_digest_ignores_current_date(self):
+        first = http_client.body_digest(
+            b'{"homeworks": [], "current_date": 100}'
+        )
+        second = http_client.body_digest(
+            b'{"homeworks": [], "current_date": 200}'
+        )
+        assert first[0] == second[0]
+        assert (first[1], second[1]) == (100, 200)
+
+    @pytest.mark.parametrize('etag', [False, True])
+    def test_unchanged_poll_skips_parsing(self, monkeypatch, etag):
+        api = fake_api.FakePracticumAPI(etag=etag)
+        server = fake_api.FakePracticumServer(api).start()
+        client = http_client.PracticumClient()
+        monkeypatch.setattr(homework, 'ENDPOINT', server.endpoint)
+        monkeypatch.setattr(homework, 'CLIENT', client)
+        try:
+            first = homework.fetch_api_answer('token', 1)
+            homework.commit_answer('token')
+            second = homework.fetch_api_answer('token', 2)
+        finally:
+            client.close()
+            server.stop()
+        assert first['homeworks'], 'Первый ответ должен разбираться целиком'
+        assert second['homeworks'] == [], (
+            'Неизменившийся ответ не должен разбираться повторно'
+        )
+        assert isinstance(second['current_date'], int)
+
+    @pytest.mark.parametrize('etag', [False, True])
+    def test_failed_poll_is_fetched_again(self, monkeypatch, etag):
+        api = fake_api.FakePracticumAPI(etag=etag)
+        server = fake_api.FakePracticumServer(api).start()
+        client = http_client.PracticumClient()
+        monkeypatch.setattr(homework, 'ENDPOINT', server.endpoint)
+        monkeypatch.setattr(homework, 'CLIENT', client)
+        try:
+            first = homework.fetch_api_answer('token', 1)
+            # Опрос упал после запроса: ответ не подтверждён commit.
+            retry = homework.fetch_api_answer('token', 1)
+        finally:
+            client.close()
+            server.stop()
+        assert first['homeworks'], 'Первый ответ должен разбираться целиком'
+        assert retry['homeworks'] == first['homeworks'], (
+            'Повтор упавшего опроса не должен терять изменения'
+        )
@@ -0,0 +1,55 @@
+import logging
+import multiprocessing
+import os
+
+import log_config
+
+
+def log_in_child(path):
+    log_config.reset_logging()
+    log_config.setup_logging(path)
+    logging.getLogger('worker').info('запись воркера')
+    log_config.stop_logging()
+
+
+class TestLogConfig:
+
+    def test_import_has_no_side_effects(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        import importlib
+
+        import homework
+        importlib.reload(homework)
+        assert not os.listdir(tmp_path), (
+            'Импорт homework не должен создавать файлы лога'
+        )
+
+    def test_records_are_written_by_listener(self, tmp_path):
+        path = tmp_path / 'bot.log'
+        listener = log_config.setup_logging(str(path))
+        try:
+            assert log_config.setup_logging(str(path)) is listener, (
+                'Повторная настройка логирования не должна дублировать '
+                'обработчики'
+            )
+            logging.getLogger('homework').debug('запись из теста')
+        finally:
+            log_config.stop_logging()
+        assert 'запись из теста' in path.read_text(encoding='utf-8')
+
+    def test_forked_child_writes_its_records(self, tmp_path):
+        parent = tmp_path / 'bot.log'
+        child = tmp_path / 'worker.log'
+        log_config.setup_logging(str(parent))
+        try:
+            process = multiprocessing.get_context('fork').Process(
+                target=log_in_child, args=(str(child),)
+            )
+            process.start()
+            process.join(10)
+        finally:
+            log_config.stop_logging()
+        assert process.exitcode == 0
+        assert 'запись воркера' in child.read_text(encoding='utf-8'), (
+            'Воркер после fork должен запускать собственный поток записи'
+        )
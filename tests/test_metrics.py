@@ -0,0 +1,55 @@
+import urllib.request
+
+import metrics
+
+
+class TestMetrics:
+
+    def test_counter_and_gauge_exposition(self):
+        registry = metrics.Registry()
+        errors = registry.counter('errors_total', 'Ошибки.', ['type'])
+        lag = registry.gauge('lag_seconds', 'Отставание.')
+        errors.inc(type='BotException')
+        errors.inc(2, type='BotException')
+        lag.set(1.5)
+        text = registry.render()
+        assert '# TYPE errors_total counter' in text
+        assert 'errors_total{type="BotException"} 3' in text
+        assert 'lag_seconds 1.5' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram('stage_seconds', 'Этапы.', ['stage'],
+                                      buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, stage='poll')
+        lines = histogram.samples()
+        assert 'stage_seconds_bucket{stage="poll",le="0.1"} 1' in lines
+        assert 'stage_seconds_bucket{stage="poll",le="1"} 2' in lines
+        assert 'stage_seconds_bucket{stage="poll",le="+Inf"} 3' in lines
+        assert 'stage_seconds_count{stage="poll"} 3' in lines
+
+    def test_timed_decorator_keeps_signature(self):
+        histogram = metrics.Histogram('f_seconds', 'Функция.')
+
+        @histogram.time()
+        def func(a, b):
+            return a + b
+
+        assert func(1, 2) == 3
+        assert func.__wrapped__.__code__.co_argcount == 2
+        assert 'f_seconds_count 1' in histogram.samples()
+
+    def test_http_endpoint(self):
+        registry = metrics.Registry()
+        registry.counter('up_total', 'Проверка.').inc()
+        server = metrics.start_http_server(port=0, registry=registry)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(
+                f'http://127.0.0.1:{port}/metrics', timeout=5
+            ) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'up_total 1' in body
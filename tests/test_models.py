@@ -0,0 +1,53 @@
+import sys
+
+import json_backend
+import models
+
+API_HOMEWORK = {
+    'id': 123,
+    'status': 'approved',
+    'homework_name': 'hw.zip',
+    'reviewer_comment': 'Всё нравится',
+    'date_updated': '2020-02-13T14:40:57Z',
+    'lesson_name': 'Итоговый проект',
+}
+
+
+class TestHomework:
+
+    def test_reads_like_api_dict(self):
+        homework = models.Homework.from_dict(API_HOMEWORK)
+        assert homework['homework_name'] == 'hw.zip'
+        assert homework.get('id') == 123
+        assert 'status' in homework
+        assert 'reviewer_comment' not in homework
+        assert homework.get('lesson_name', 'нет') == 'нет'
+
+    def test_missing_field_raises_key_error(self):
+        homework = models.Homework.from_dict({'status': 'approved'})
+        assert 'homework_name' not in homework
+        try:
+            homework['homework_name']
+        except KeyError:
+            pass
+        else:
+            assert False, 'Отсутствующее поле должно вызывать KeyError'
+
+    def test_status_is_interned(self):
+        status = ''.join(['appr', 'oved'])
+        homework = models.Homework(status=status)
+        assert homework.status is models.STATUSES['approved'], (
+            'Известные статусы должны храниться общими объектами строк'
+        )
+
+    def test_record_is_smaller_than_dict(self):
+        homework = models.Homework.from_dict(API_HOMEWORK)
+        assert not hasattr(homework, '__dict__')
+        assert sys.getsizeof(homework) < sys.getsizeof(API_HOMEWORK)
+
+
+class TestJsonBackend:
+
+    def test_loads_bytes(self):
+        assert json_backend.loads(b'{"homeworks": []}') == {'homeworks': []}
+        assert json_backend.BACKEND in ('orjson', 'ujson', 'json')
@@ -0,0 +1,88 @@
+import sqlite3
+import time
+
+import outbox
+
+
+class TestOutbox:
+
+    def test_wal_mode(self, tmp_path):
+        journal = outbox.Outbox(str(tmp_path / 'outbox.sqlite3'))
+        mode = journal._conn.execute('PRAGMA journal_mode').fetchone()[0]
+        journal.close()
+        assert mode == 'wal', 'Журнал должен работать в режиме WAL'
+
+    def test_undelivered_messages_are_replayed(self, tmp_path):
+        path = str(tmp_path / 'outbox.sqlite3')
+        journal = outbox.Outbox(path, batch_size=100, flush_interval=3600)
+        first = journal.add(1, ['a', 'b'])
+        second = journal.add(2, ['c'])
+        journal.add(1, ['d'])
+        journal.ack(first)
+        journal.close()
+
+        restored = outbox.Outbox(path, batch_size=2)
+        pending = list(restored.pending())
+        restored.close()
+        assert pending == [('2', second, ['c']), ('1', [4], ['d'])], (
+            'После перезапуска должны повторяться только '
+            'неподтверждённые сообщения в исходном порядке'
+        )
+
+    def test_acks_are_batched(self, tmp_path):
+        journal = outbox.Outbox(str(tmp_path / 'outbox.sqlite3'),
+                                batch_size=3, flush_interval=3600)
+        ids = journal.add(1, ['a', 'b', 'c'])
+        journal.ack(ids[:2])
+        assert len(sum((i for _, i, _ in journal.pending()), [])) == 3
+        journal.ack(ids[2:])
+        assert list(journal.pending()) == []
+        journal.close()
+
+    def test_failed_messages_are_not_replayed(self, tmp_path):
+        path = str(tmp_path / 'outbox.sqlite3')
+        journal = outbox.Outbox(path, retention=0)
+        failed = journal.add(1, ['a'])
+        kept = journal.add(2, ['b'])
+        journal.fail(failed)
+        journal.close()
+
+        restored = outbox.Outbox(path, retention=0)
+        pending = list(restored.pending())
+        time.sleep(0.01)
+        purged = restored.purge()
+        restored.close()
+        assert pending == [('2', kept, ['b'])], (
+            'Недоставляемые сообщения не должны повторяться после перезапуска'
+        )
+        assert purged == 1
+
+    def test_acks_are_flushed_by_timer(self, tmp_path):
+        journal = outbox.Outbox(str(tmp_path / 'outbox.sqlite3'),
+                                batch_size=100, flush_interval=0.05)
+        ids = journal.add(1, ['a'])
+        journal.ack(ids)
+        deadline = time.monotonic() + 5
+        while list(journal.pending()) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert list(journal.pending()) == [], (
+            'Последние подтверждения должны фиксироваться без новых сообщений'
+        )
+        journal.close()
+
+    def test_old_journal_is_migrated(self, tmp_path):
+        path = str(tmp_path / 'outbox.sqlite3')
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            'CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'chat_id TEXT NOT NULL, text TEXT NOT NULL, '
+            'created REAL NOT NULL, delivered REAL);'
+            "INSERT INTO outbox (chat_id, text, created) VALUES ('1', 'a', 0);"
+        )
+        conn.close()
+        journal = outbox.Outbox(path)
+        pending = list(journal.pending())
+        journal.fail([1])
+        assert list(journal.pending()) == []
+        journal.close()
+        assert pending == [('1', [1], ['a'])]
@@ -0,0 +1,74 @@
+import pytest
+
+import polling
+from exeptions import RetryPolicy
+
+
+def make_interval():
+    return polling.AdaptiveInterval(
+        base=600, minimum=60, maximum=3600, factor=2, jitter=0.1,
+        rand=lambda: 0.5,
+    )
+
+
+class TestAdaptiveInterval:
+
+    def test_fast_while_reviewing(self):
+        interval = make_interval()
+        delay = interval.on_result(
+            [{'homework_name': 'hw', 'status': 'reviewing'}]
+        )
+        assert delay == 60, 'Во время проверки опрос должен быть частым'
+        assert interval.on_result([]) == 60, (
+            'Частый опрос должен сохраняться, пока работа на проверке'
+        )
+        interval.on_result([{'homework_name': 'hw', 'status': 'approved'}])
+        assert interval.on_result([]) == 1200
+
+    def test_backoff_until_maximum(self):
+        interval = make_interval()
+        delays = [interval.on_result([]) for _ in range(5)]
+        assert delays == [1200, 2400, 3600, 3600, 3600], (
+            'Без изменений интервал должен расти экспоненциально до максимума'
+        )
+
+    def test_retry_after_has_priority(self):
+        interval = make_interval()
+        assert interval.on_error(5) == pytest.approx(5.25)
+        assert interval.on_error() == 1200
+
+    def test_retry_after_jitter_only_lengthens(self):
+        interval = make_interval()
+        interval.rand = lambda: 0.0
+        assert interval.on_error(100) == 100
+        interval.rand = lambda: 1.0
+        assert interval.on_error(100) == pytest.approx(110), (
+            'Разброс после Retry-After должен быть пропорционален паузе'
+        )
+
+    def test_zero_retry_after_uses_policy(self):
+        interval = make_interval()
+        policy = RetryPolicy(initial=2, factor=2, maximum=5, attempts=3)
+        assert interval.on_error(0, policy) == 2, (
+            'Нулевой Retry-After не должен приводить к повтору без паузы'
+        )
+
+    def test_jitter_bounds(self):
+        interval = polling.AdaptiveInterval(base=100, factor=1, jitter=0.1,
+                                            rand=lambda: 0.0)
+        assert interval.on_result([]) == 90
+        interval.rand = lambda: 1.0
+        assert interval.on_result([]) == 110
+
+    def test_fast_retries_for_transient_errors(self):
+        interval = make_interval()
+        policy = RetryPolicy(initial=2, factor=2, maximum=5, attempts=3)
+        delays = [interval.on_error(policy=policy) for _ in range(4)]
+        assert delays == [2, 4, 5, 1200], (
+            'Временные ошибки должны повторяться быстро, '
+            'а после попыток — с обычным интервалом'
+        )
+        interval.on_result([])
+        assert interval.on_error(policy=policy) == 2, (
+            'Успешный опрос должен сбрасывать счётчик быстрых повторов'
+        )
@@ -0,0 +1,69 @@
+import tracemalloc
+
+import profiling
+
+
+def busy():
+    return sum(range(1000))
+
+
+class TestProfiler:
+
+    def test_disabled_does_nothing(self, tmp_path):
+        path = tmp_path / 'profile.log'
+        profiler = profiling.Profiler(path=str(path))
+        with profiler.iteration():
+            busy()
+        profiler.dump()
+        assert profiler.iterations == 0, (
+            'Выключенный профилировщик не должен считать итерации'
+        )
+        assert not tracemalloc.is_tracing()
+
+    def test_report_contains_functions_and_sizes(self, tmp_path):
+        path = tmp_path / 'profile.log'
+        profiler = profiling.Profiler(
+            path=str(path), sample_every=2, dump_interval=3600
+        )
+        profiler.track('CACHE', lambda: 42)
+        profiler.enable()
+        try:
+            for _ in range(4):
+                with profiler.iteration():
+                    busy()
+        finally:
+            profiler.disable()
+        report = path.read_text(encoding='utf-8')
+        assert 'итераций: 4' in report
+        assert 'CACHE: 42' in report, (
+            'В отчёте должен быть размер отслеживаемых структур'
+        )
+        assert 'busy' in report, (
+            'В отчёте должны быть профилированные функции'
+        )
+        assert 'Наибольший рост выделений памяти' in report
+        assert not tracemalloc.is_tracing(), (
+            'После выключения tracemalloc должен быть остановлен'
+        )
+
+    def test_toggle(self, tmp_path):
+        profiler = profiling.Profiler(path=str(tmp_path / 'profile.log'))
+        profiler.toggle()
+        assert profiler.enabled
+        profiler.toggle()
+        assert not profiler.enabled
+
+    def test_signal_only_requests_toggle(self, tmp_path):
+        profiler = profiling.Profiler(path=str(tmp_path / 'profile.log'))
+        # Сигнал пришёл, пока поток держит замок профилировщика.
+        with profiler._lock:
+            profiler.request_toggle()
+        assert not profiler.enabled, (
+            'Обработчик сигнала не должен переключать профилирование сам'
+        )
+        with profiler.iteration():
+            busy()
+        assert profiler.enabled, (
+            'Запрошенное сигналом переключение выполняет цикл'
+        )
+        profiler.disable()
@@ -0,0 +1,50 @@
+from utils import FakeClock
+
+import scheduler
+
+
+class TestScheduler:
+
+    def test_fixed_rate_does_not_drift(self):
+        assert scheduler.fixed_rate(100, 600, 130) == 700, (
+            'Следующий срок считается от прошлого срока, а не от конца работы'
+        )
+        assert scheduler.fixed_rate(100, 600, 900) == 900, (
+            'Пропущенный срок не должен догоняться пачкой'
+        )
+
+    def test_spread_evenly(self):
+        clock = FakeClock()
+        schedule = scheduler.Scheduler(clock=clock)
+        schedule.spread(range(4), 600)
+        assert schedule.pop_due() == [(0, 0.0)]
+        clock.now = 300
+        assert schedule.pop_due() == [(1, 150.0), (2, 300.0)], (
+            'Первые опросы должны быть разложены по интервалу'
+        )
+        assert schedule.wait_time() == 150
+
+    def test_reschedule_replaces_due(self):
+        clock = FakeClock()
+        schedule = scheduler.Scheduler(clock=clock)
+        schedule.add('a', 10)
+        schedule.add('b', 20)
+        schedule.add('a', 30)
+        assert len(schedule) == 2
+        clock.now = 25
+        assert schedule.pop_due() == [('b', 20)], (
+            'Устаревший срок ключа должен пропускаться'
+        )
+        schedule.remove('a')
+        assert schedule.next_due() is None
+        clock.now = 40
+        assert schedule.reschedule('b', 20, 10) == 40
+
+    def test_many_keys_in_order(self):
+        clock = FakeClock()
+        schedule = scheduler.Scheduler(clock=clock)
+        for key in range(10000, 0, -1):
+            schedule.add(key, key)
+        clock.now = 5
+        assert [key for key, _ in schedule.pop_due()] == [1, 2, 3, 4, 5]
+        assert schedule.next_due() == 6
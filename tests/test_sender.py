@@ -0,0 +1,67 @@
+import pytest
+import telegram
+from utils import FakeClock
+
+import sender
+from exeptions import BotException
+
+
+class FloodBot:
+
+    def __init__(self, floods=0, error=None):
+        self.floods = floods
+        self.error = error
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        if self.error is not None:
+            raise self.error
+        if self.floods:
+            self.floods -= 1
+            raise telegram.error.RetryAfter(7)
+        self.sent.append((chat_id, text))
+        return text
+
+
+class TestTokenBucket:
+
+    def test_rate_is_limited(self):
+        clock = FakeClock()
+        bucket = sender.TokenBucket(2, capacity=2, clock=clock,
+                                    sleep=clock.sleep)
+        for _ in range(4):
+            bucket.acquire()
+        assert clock.sleeps == [0.5, 0.5], (
+            'После исчерпания ведра токены должны выдаваться с частотой rate'
+        )
+
+
+class TestTelegramSender:
+
+    def test_coalesce_respects_length(self):
+        parts = sender.coalesce(['a' * 3, 'b' * 3, 'c' * 3], max_length=8)
+        assert parts == ['aaa\n\nbbb', 'ccc']
+        assert sender.coalesce(['x' * 5], max_length=2) == ['xx', 'xx', 'x']
+
+    def test_messages_for_chat_are_merged(self):
+        bot = FloodBot()
+        telegram_sender = sender.TelegramSender(sleep=lambda s: None)
+        telegram_sender.send(bot, 1, ['первое', 'второе'])
+        assert bot.sent == [(1, 'первое\n\nвторое')], (
+            'Несколько статусов одному чату должны уйти одним сообщением'
+        )
+
+    def test_retry_after_is_honored(self):
+        bot = FloodBot(floods=2)
+        sleeps = []
+        telegram_sender = sender.TelegramSender(sleep=sleeps.append)
+        assert telegram_sender.send(bot, 1, ['текст']) == 'текст'
+        assert sleeps.count(7.0) == 2, (
+            'При флуд-контроле повтор должен быть ровно через retry_after'
+        )
+
+    def test_other_errors_raise_bot_exception(self):
+        bot = FloodBot(error=telegram.error.BadRequest('chat not found'))
+        telegram_sender = sender.TelegramSender(sleep=lambda s: None)
+        with pytest.raises(BotException):
+            telegram_sender.send(bot, 1, ['текст'])
@@ -0,0 +1,46 @@
+import homework
+import polling
+import settings
+from error_cache import ErrorCache
+from state_cache import StateCache
+
+
+class TestWarmRestart:
+
+    def test_state_survives_restart(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(homework, 'SNAPSHOT_FILE',
+                            str(tmp_path / 'snapshot.json'))
+        monkeypatch.setattr(homework, 'CACHE', ErrorCache())
+        monkeypatch.setattr(homework, 'STATE', StateCache())
+        homework.CACHE.add('Сбой в работе программы')
+        homework.STATE.update(1, [{'id': 7, 'homework_name': 'hw',
+                                   'status': 'approved'}])
+        interval = polling.AdaptiveInterval()
+        interval.current = 120
+        homework.save_state('key', 4242, interval, next_poll=0)
+
+        monkeypatch.setattr(homework, 'CACHE', ErrorCache())
+        monkeypatch.setattr(homework, 'STATE', StateCache())
+        restored = polling.AdaptiveInterval()
+        snapshot = homework.restore_state('key', restored)
+        assert snapshot['cursor'] == 4242
+        assert restored.current == 120
+        assert not homework.cache_err('Сбой в работе программы'), (
+            'После перезапуска ошибка не должна отправляться повторно'
+        )
+        assert [e.status for e in homework.STATE.latest(1)] == ['approved'], (
+            'Статусы для /status должны переживать перезапуск'
+        )
+        assert homework.restore_state('other', restored) == {}, (
+            'Курсор другого токена не должен восстанавливаться'
+        )
+
+    def test_reload_settings(self, monkeypatch):
+        monkeypatch.setitem(homework.HOMEWORK_STATUSES, 'approved', 'старое')
+        monkeypatch.setattr(homework, 'RETRY_TIME', 1)
+        interval = polling.AdaptiveInterval(base=1)
+        homework.reload_settings(interval)
+        assert homework.HOMEWORK_STATUSES['approved'] != 'старое', (
+            'SIGHUP должен перечитывать вердикты из settings.py'
+        )
+        assert interval.base == homework.RETRY_TIME == settings.RETRY_TIME
@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+import homework
+import single_flight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_result(self):
+        flights = single_flight.SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch(value):
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            return value * 2
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(flights.do('a', fetch, 1))
+        )
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(
+                target=lambda: results.append(flights.do('a', fetch, 1))
+            )
+            for _ in range(3)
+        ]
+        for thread in followers:
+            thread.start()
+        while flights.shared < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+        assert calls == [1], (
+            'Одновременные запросы с одним ключом должны объединяться'
+        )
+        assert results == [2] * 4
+
+    def test_error_is_shared_and_not_cached(self):
+        flights = single_flight.SingleFlight()
+
+        def fail():
+            raise ValueError('сбой')
+
+        with pytest.raises(ValueError):
+            flights.do('a', fail)
+        assert flights.do('a', lambda: 'ok') == 'ok', (
+            'Результат не должен кэшироваться после завершения вызова'
+        )
+
+    def test_different_cursors_are_not_coalesced(self, monkeypatch):
+        release = threading.Event()
+        calls = []
+
+        def mock_fetch(token, current_timestamp):
+            calls.append(current_timestamp)
+            release.wait(5)
+            return {'homeworks': [], 'current_date': current_timestamp}
+
+        monkeypatch.setattr(homework, 'FLIGHTS', single_flight.SingleFlight())
+        monkeypatch.setattr(homework, 'fetch_api_answer', mock_fetch)
+        results = {}
+        threads = [
+            threading.Thread(target=lambda cursor=cursor: results.update(
+                {cursor: homework.fetch_coalesced('token', cursor)}
+            ))
+            for cursor in (100, 200)
+        ]
+        for thread in threads:
+            thread.start()
+        while len(calls) < 2 and homework.FLIGHTS.shared == 0:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        assert sorted(calls) == [100, 200], (
+            'Запросы с разными курсорами не должны объединяться'
+        )
+        assert results[200]['current_date'] == 200
@@ -0,0 +1,35 @@
+import status_index
+
+
+class TestStatusIndex:
+
+    def test_only_transitions_are_reported(self):
+        index = status_index.StatusIndex()
+        homeworks = [
+            {'id': 1, 'homework_name': 'a', 'status': 'reviewing'},
+            {'id': 2, 'homework_name': 'b', 'status': 'approved'},
+        ]
+        assert index.changed(homeworks) == homeworks
+        for homework in homeworks:
+            index.remember(homework)
+        assert index.changed(homeworks) == [], (
+            'Уже доставленные статусы не должны отправляться повторно'
+        )
+        homeworks[0]['status'] = 'rejected'
+        assert index.changed(homeworks) == [homeworks[0]]
+
+    def test_name_is_used_without_id(self):
+        index = status_index.StatusIndex()
+        index.remember({'homework_name': 'hw', 'status': 'approved'})
+        assert index.get('hw') == 'approved'
+
+    def test_persistence(self, tmp_path):
+        path = str(tmp_path / 'statuses.json')
+        index = status_index.StatusIndex(path)
+        index.remember({'id': 7, 'status': 'approved'})
+        index.flush()
+        restored = status_index.StatusIndex(path)
+        assert restored.get(7) == 'approved', (
+            'Индекс статусов должен восстанавливаться с диска'
+        )
+        assert restored.changed([{'id': 7, 'status': 'approved'}]) == []
@@ -0,0 +1,73 @@
+import pytest
+
+import supervisor
+from settings import TELEGRAM_GLOBAL_RATE
+
+
+def subscriptions(count):
+    return [(f'token-{number}', number) for number in range(count)]
+
+
+class TestHashRing:
+
+    def test_keys_are_spread_evenly(self):
+        shards = supervisor.shard(subscriptions(4000),
+                                  supervisor.HashRing(range(4)))
+        sizes = [len(items) for items in shards.values()]
+        assert min(sizes) > 700, (
+            'Подписки должны распределяться между воркерами равномерно'
+        )
+
+    def test_adding_node_moves_minimal_share(self):
+        items = subscriptions(4000)
+        ring = supervisor.HashRing(range(4))
+        before = {token: ring.node_for(token) for token, _ in items}
+        ring.add(4)
+        moved = [token for token, _ in items
+                 if ring.node_for(token) != before[token]]
+        assert all(ring.node_for(token) == 4 for token in moved), (
+            'Переезжать должны только подписки на новый воркер'
+        )
+        assert len(moved) < len(items) * 0.3
+
+
+class TestSupervisor:
+
+    def test_resize_restarts_only_changed_workers(self, monkeypatch):
+        spawned = []
+        terminated = []
+        sup = supervisor.Supervisor('token', subscriptions(3), workers=2)
+        monkeypatch.setattr(sup, 'spawn', spawned.append)
+        monkeypatch.setattr(sup, 'terminate', terminated.append)
+        changed = sup.resize(2)
+        assert changed == [] and spawned == []
+        changed = sup.resize(3)
+        assert 2 in changed
+        assert set(spawned) == set(changed)
+        assert len(sum(sup.shards.values(), [])) == 3
+
+    def test_workers_share_global_rate(self, monkeypatch):
+        started = {}
+
+        class MockProcess:
+
+            def __init__(self, target, name, args):
+                self.pid = None
+                started[args[0]] = args[3]
+
+            def start(self):
+                pass
+
+        monkeypatch.setattr(supervisor.multiprocessing, 'Process',
+                            MockProcess)
+        sup = supervisor.Supervisor('token', subscriptions(30), workers=3)
+        monkeypatch.setattr(sup, 'terminate', lambda index: None)
+        for index in sup.ring.nodes:
+            sup.spawn(index)
+        assert sum(started.values()) == pytest.approx(TELEGRAM_GLOBAL_RATE), (
+            'Воркеры с одним токеном бота должны делить общий лимит'
+        )
+        sup.resize(4)
+        assert sum(started.values()) == pytest.approx(TELEGRAM_GLOBAL_RATE), (
+            'После добавления воркера доли лимита должны уменьшиться'
+        )
@@ -0,0 +1,73 @@
+import settings
+import timeline
+
+
+def homework(status, date, key=1):
+    return {'id': key, 'homework_name': f'hw{key}', 'status': status,
+            'date_updated': date}
+
+
+class TestTimeline:
+
+    def test_append_and_query_indexes(self, tmp_path):
+        log = timeline.Timeline(str(tmp_path / 'timeline.bin'))
+        log.append('a', [homework('reviewing', '2022-01-01T00:00:00Z', 1),
+                         homework('reviewing', '2022-01-01T00:00:00Z', 2)])
+        log.append('b', [homework('reviewing', '2022-01-02T00:00:00Z', 3)])
+        log.append('a', [homework('approved', '2022-01-01T02:00:00Z', 1)])
+        assert len(log) == 4
+        assert [e.status for e in log.for_homework(1)] == [
+            'reviewing', 'approved'
+        ], 'История работы должна идти в порядке записи'
+        assert len(log.for_student('a')) == 3
+        assert len(log.for_student('b')) == 1, (
+            'Индекс по студенту не должен смешивать студентов'
+        )
+        log.close()
+
+    def test_status_codes_do_not_follow_settings(self, tmp_path,
+                                                 monkeypatch):
+        path = tmp_path / 'timeline.bin'
+        log = timeline.Timeline(str(path))
+        log.append('a', [homework('rejected', None)])
+        log.close()
+        monkeypatch.setattr(settings, 'HOMEWORK_STATUSES', {
+            'draft': '', 'rejected': '', 'reviewing': '', 'approved': '',
+        })
+        log = timeline.Timeline(str(path))
+        assert [e.status for e in log.events()] == ['rejected'], (
+            'Изменение статусов в настройках не должно менять старые записи'
+        )
+        log.close()
+        record = path.read_bytes()[len(timeline.HEADER):]
+        assert timeline.RECORD.unpack(record)[2] == 2
+
+    def test_reopen_drops_partial_record(self, tmp_path):
+        path = tmp_path / 'timeline.bin'
+        log = timeline.Timeline(str(path))
+        log.append('a', [homework('reviewing', None)], observed=10)
+        log.close()
+        with open(path, 'ab') as file:
+            file.write(b'\x00' * 5)
+        log = timeline.Timeline(str(path))
+        log.append('a', [homework('rejected', None)], observed=70)
+        assert [e.observed for e in log.events()] == [10, 70], (
+            'Недописанная запись должна отбрасываться при открытии'
+        )
+        assert list(log.turnarounds()) == [60], (
+            'Без date_updated длительность считается по времени наблюдения'
+        )
+        log.close()
+
+    def test_turnaround_percentiles(self, tmp_path):
+        log = timeline.Timeline(str(tmp_path / 'timeline.bin'))
+        for key in range(1, 101):
+            log.append('a', [homework('reviewing', None, key)], observed=0)
+            log.append('a', [homework('approved', None, key)],
+                       observed=key)
+        result = log.turnaround((0.5, 0.99))
+        assert result == {0.5: 51, 0.99: 100}
+        assert log.turnaround(token='nobody') == {
+            0.5: 0.0, 0.9: 0.0, 0.99: 0.0
+        }
+        log.close()
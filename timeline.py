@@ -0,0 +1,247 @@
+"""Журнал смен статусов домашних работ с индексами и аналитикой."""
+import argparse
+import hashlib
+import itertools
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import (Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    Sequence, Union)
+
+from checkpoint import token_key
+from settings import TIMELINE_FILE
+from status_index import homework_key
+
+logger = logging.getLogger(__name__)
+
+HEADER = b'HWTL0001'
+# Ключ работы, ключ студента, код статуса, date_updated, время наблюдения.
+RECORD = struct.Struct('<QQBdd')
+# Коды статусов записаны в файл навсегда: не выводите их из порядка
+# HOMEWORK_STATUSES и не меняйте. Новый статус — только новый код.
+STATUS_CODES = {'approved': 0, 'reviewing': 1, 'rejected': 2}
+CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+UNKNOWN_STATUS = 255
+# Сколько записей читать из mmap за раз при полном проходе.
+CHUNK_RECORDS = 4096
+REVIEWING = 'reviewing'
+
+
+class Event(NamedTuple):
+    """Смена статуса работы."""
+
+    homework: int
+    student: int
+    status: Optional[str]
+    updated: float
+    observed: float
+
+
+def key_hash(key: Union[int, str]) -> int:
+    """64-битный ключ работы по её id или имени."""
+    digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def student_hash(token: str) -> int:
+    """64-битный ключ студента, не раскрывающий токен."""
+    return int(token_key(token), 16)
+
+
+def parse_date(value: Optional[str]) -> float:
+    """Переводит `date_updated` вида 2022-01-01T12:00:00Z в секунды."""
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(
+            value.replace('Z', '+00:00')
+        ).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def percentiles(values: Sequence[float],
+                fractions: Iterable[float]) -> Dict[float, float]:
+    """Перцентили по неотсортированным значениям."""
+    ordered = sorted(values)
+    if not ordered:
+        return {fraction: 0.0 for fraction in fractions}
+    last = len(ordered) - 1
+    return {
+        fraction: ordered[min(int(len(ordered) * fraction), last)]
+        for fraction in fractions
+    }
+
+
+def turnarounds(events: Iterable[Event]) -> array:
+    """
+    Длительности проверок в секундах: от перехода работы
+    в `reviewing` до следующего вердикта. События читаются потоком,
+    в памяти только работы, которые сейчас на проверке.
+    """
+    started: Dict[int, float] = {}
+    durations = array('d')
+    for event in events:
+        moment = event.updated or event.observed
+        if event.status == REVIEWING:
+            started[event.homework] = moment
+        elif event.homework in started:
+            durations.append(moment - started.pop(event.homework))
+    return durations
+
+
+class Timeline:
+    """
+    Журнал смен статусов: записи фиксированного размера дописываются
+    в конец файла, чтение идёт через mmap без загрузки файла в память.
+    Индексы по работе и по студенту хранят только номера записей
+    в компактных массивах и строятся при первом запросе.
+    """
+
+    def __init__(self, path: str = TIMELINE_FILE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a+b')
+        self._count = self._check()
+        self._by_homework: Optional[Dict[int, array]] = None
+        self._by_student: Optional[Dict[int, array]] = None
+
+    def _check(self) -> int:
+        """Проверяет заголовок и отрезает недописанную запись."""
+        size = os.fstat(self._file.fileno()).st_size
+        if size == 0:
+            self._file.write(HEADER)
+            self._file.flush()
+            return 0
+        self._file.seek(0)
+        if self._file.read(len(HEADER)) != HEADER:
+            raise ValueError(f'{self.path} не является журналом статусов')
+        count, tail = divmod(size - len(HEADER), RECORD.size)
+        if tail:
+            logger.warning(f'Журнал {self.path}: отброшена недописанная '
+                           f'запись ({tail} байт)')
+            self._file.truncate(len(HEADER) + count * RECORD.size)
+        return count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, token: str, homeworks: Iterable,
+               observed: Optional[float] = None) -> int:
+        """Дописывает смены статусов работ студента, возвращает их число."""
+        observed = time.time() if observed is None else observed
+        student = student_hash(token)
+        rows = [
+            (key_hash(homework_key(hw)), student,
+             STATUS_CODES.get(hw.get('status'), UNKNOWN_STATUS),
+             parse_date(hw.get('date_updated')), observed)
+            for hw in homeworks
+        ]
+        if not rows:
+            return 0
+        data = b''.join(RECORD.pack(*row) for row in rows)
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+            first = self._count
+            self._count += len(rows)
+            if self._by_homework is not None:
+                for number, row in enumerate(rows, first):
+                    self._index(number, row[0], row[1])
+        return len(rows)
+
+    def _index(self, number: int, homework: int, student: int) -> None:
+        self._by_homework.setdefault(homework, array('I')).append(number)
+        self._by_student.setdefault(student, array('I')).append(number)
+
+    def _build_index(self) -> None:
+        self._by_homework, self._by_student = {}, {}
+        for number, row in enumerate(self._rows()):
+            self._index(number, row[0], row[1])
+
+    def _rows(self, numbers: Optional[Iterable[int]] = None) -> Iterator:
+        """Кортежи записей из mmap: все подряд или по номерам."""
+        end = len(HEADER) + self._count * RECORD.size
+        if self._count == 0:
+            return
+        with mmap.mmap(self._file.fileno(), 0,
+                       access=mmap.ACCESS_READ) as view:
+            if numbers is None:
+                step = RECORD.size * CHUNK_RECORDS
+                for offset in range(len(HEADER), end, step):
+                    yield from RECORD.iter_unpack(
+                        view[offset:min(offset + step, end)]
+                    )
+                return
+            for number in numbers:
+                yield RECORD.unpack_from(
+                    view, len(HEADER) + number * RECORD.size
+                )
+
+    def events(self, numbers: Optional[Iterable[int]] = None
+               ) -> Iterator[Event]:
+        """События журнала: все или с указанными номерами."""
+        for homework, student, code, updated, observed in self._rows(
+            numbers
+        ):
+            yield Event(homework, student, CODE_STATUSES.get(code),
+                        updated, observed)
+
+    def _numbers(self, index: str, key: int) -> array:
+        with self._lock:
+            if self._by_homework is None:
+                self._build_index()
+            return array('I', getattr(self, index).get(key, ()))
+
+    def for_homework(self, key: Union[int, str]) -> List[Event]:
+        """История статусов работы по её id или имени."""
+        return list(self.events(self._numbers('_by_homework',
+                                              key_hash(key))))
+
+    def for_student(self, token: str) -> List[Event]:
+        """История статусов всех работ студента."""
+        return list(self.events(self._numbers('_by_student',
+                                              student_hash(token))))
+
+    def turnarounds(self, token: Optional[str] = None) -> array:
+        """Длительности проверок студента или, без токена, всех."""
+        numbers = None
+        if token is not None:
+            numbers = self._numbers('_by_student', student_hash(token))
+        return turnarounds(self.events(numbers))
+
+    def turnaround(self, fractions: Iterable[float] = (0.5, 0.9, 0.99),
+                   token: Optional[str] = None) -> Dict[float, float]:
+        """Перцентили длительности проверки в секундах."""
+        return percentiles(self.turnarounds(token), fractions)
+
+    def close(self) -> None:
+        """Закрывает файл журнала."""
+        with self._lock:
+            self._file.close()
+
+
+def main() -> None:
+    """Выводит перцентили длительности проверки по журналам."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('paths', nargs='*', default=[TIMELINE_FILE])
+    args = parser.parse_args()
+    timelines = [Timeline(path) for path in args.paths]
+    durations = turnarounds(
+        itertools.chain.from_iterable(t.events() for t in timelines)
+    )
+    print(f'событий: {sum(len(t) for t in timelines)}, '
+          f'проверок: {len(durations)}')
+    for timeline in timelines:
+        timeline.close()
+    for fraction, seconds in percentiles(durations, (0.5, 0.9, 0.99)).items():
+        print(f'p{fraction * 100:g}: {seconds / 3600:.1f} ч')
+
+
+if __name__ == '__main__':
+    main()